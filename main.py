@@ -1,17 +1,23 @@
 import logging
+import logging.handlers
 import asyncio
+import queue
+import copy
 import json
 import os
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+import orjson
+import msgspec
+import aiofiles
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest, RetryAfter
+from telegram.helpers import escape_markdown
+from telegram.request import HTTPXRequest
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes, ConversationHandler
-from telethon import TelegramClient, events
-from telethon.tl.types import Channel
-import nest_asyncio
-nest_asyncio.apply()
-
-# Local imports
-from telegram_listener import TelegramListener
-from solana_trader import SolanaTrader
 
 # Set up logging
 logging.basicConfig(
@@ -20,24 +26,496 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+def _start_log_listener():
+    """Move log output off the event loop.
+
+    The root logger's handlers are replaced by a QueueHandler, and the original
+    handlers are driven by a QueueListener thread, so writing a log line never
+    blocks the loop. Returns the listener; call stop() on it to flush.
+    """
+    root = logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *root.handlers, respect_handler_level=True)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
 # Conversation states
 SETUP, ADDING_GROUP, REMOVING_GROUP, SETTING_INVESTMENT, SETTING_TAKE_PROFIT = range(5)
 
+# key=value lines in credentials.txt as (key, quote, value); one matching pair
+# of outer quotes is dropped from the value, quotes inside it are kept
+_CRED_RE = re.compile(r'^[ \t]*([^=\s]+)[ \t]*=[ \t]*(["\']?)(.*?)\2[ \t]*\r?$', re.M)
+
+# Seconds to wait before flushing a debounced config write
+SAVE_DEBOUNCE_DELAY = 0.2
+
+# trading_settings.json is meant to be hand-editable, so keep it indented and stable
+SETTINGS_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
+
+# traded_tokens.log is rewritten once it holds this many more lines than
+# twice the number of tokens still in cooldown
+TRADED_LOG_COMPACT_SLACK = 1000
+
+# How long to watch a bought token for take profit, in seconds
+MAX_MONITORING_TIME = 60 * 60 * 24  # 24 hours
+
+# Most take profit monitors checking a price or selling at the same time; the
+# rest wait their turn. Kept well under the shared HTTP pool's 100 connections
+# so buys and balance lookups still get through.
+MAX_CONCURRENT_MONITOR_CHECKS = 20
+
+# Bounds for the adaptive price polling interval in monitor_token_price, in seconds
+MIN_PRICE_POLL_INTERVAL = 60
+MAX_PRICE_POLL_INTERVAL = 600
+# Prices within this many multiples of the configured take-profit distance are
+# polled every MIN_PRICE_POLL_INTERVAL; further away the interval grows in
+# proportion to the distance
+PRICE_POLL_BACKOFF_START = 2
+
+# Notification delivery: wait this long for a burst to arrive, join at most
+# NOTIFY_MAX_BATCH queued messages into one send, and send at most one
+# message per NOTIFY_MIN_INTERVAL seconds to a chat
+NOTIFY_COALESCE_DELAY = 0.05
+NOTIFY_MAX_BATCH = 6
+NOTIFY_MIN_INTERVAL = 1.0
+NOTIFY_SEPARATOR = "\n\n---\n\n"
+# Seconds to keep sending queued notifications on shutdown before giving up
+NOTIFY_DRAIN_TIMEOUT = 5.0
+
+# Minimum seconds between error replies to the same chat; errors in between are only logged
+ERROR_REPLY_INTERVAL = 10.0
+
+# Static help texts for /help and the Help menu button
+_HELP_TEXT_CMD = (
+    "🤖 *Solana Trading Bot Commands* 🤖\n\n"
+    "*Wallet Commands:*\n"
+    "/create_wallet - Generate a new Solana wallet\n"
+    "/wallet_info - Display your current wallet info\n"
+    "/withdraw <amount> <address> - Withdraw funds to another wallet\n\n"
+
+    "*Group Management:*\n"
+    "/add_group <group_link> - Add a Telegram group to monitor\n"
+    "/remove_group - Shows a list of groups to remove\n"
+    "/list_groups - List all monitored groups\n\n"
+
+    "*Trading Settings:*\n"
+    "/settings - View current trading settings\n"
+    "/set_investment <amount> - Set initial investment amount in SOL\n"
+    "/set_take_profit <profit_percentage> <sell_percentage> - Set take profit conditions\n"
+    "Example: /set_take_profit 30 50 - Sell 50% when profit reaches 30%\n\n"
+
+    "*Other Commands:*\n"
+    "/start - Show the main menu\n"
+    "/help - Display this help message"
+)
+
+_HELP_TEXT_CB = (
+    "🤖 *Solana Trading Bot Help* 🤖\n\n"
+    "*How it works:*\n"
+    "1. Create a wallet or import an existing one\n"
+    "2. Add Telegram groups to monitor\n"
+    "3. Configure your trading settings\n"
+    "4. The bot will automatically trade when new tokens are posted\n\n"
+
+    "*Commands:*\n"
+    "/start - Show main menu\n"
+    "/help - Show this help\n"
+    "/create_wallet - Create a new wallet\n"
+    "/add_group - Add a group to monitor\n"
+    "/settings - Configure trading parameters"
+)
+
+class WalletRecord(msgspec.Struct):
+    """A single wallet as stored in wallets.json."""
+    public_key: str
+    private_key: str
+    name: str = ""
+
+
+class WalletStore(msgspec.Struct):
+    """Schema of wallets.json."""
+    wallets: list[WalletRecord] = []
+    active_wallet_index: int = -1
+
+    def __post_init__(self):
+        # Unnamed wallets are labelled by position
+        for i, wallet in enumerate(self.wallets):
+            if not wallet.name:
+                wallet.name = f"Wallet {i+1}"
+
+
+class TradingSettings(msgspec.Struct):
+    """Schema of trading_settings.json, including the defaults for a fresh install."""
+    initial_investment: float = 0.1  # SOL
+    take_profit_percentage: float = 30  # %
+    sell_percentage: float = 50  # %
+    max_slippage: float = 1  # %
+    # Seconds after a buy during which the same token is not bought again
+    cooldown_seconds: float = 7 * 24 * 60 * 60
+    # Legacy: traded tokens now live in traded_tokens.log and are migrated
+    # out of this file on startup
+    traded_tokens: list[str] = []
+
+
+# Parsed JSON files keyed by path -> (st_mtime_ns, st_size, parsed object)
+_json_cache = {}
+
+# Stands in for NaN/Infinity while parsing hand-edited JSON; see _drop_unusable_values
+_NON_FINITE = object()
+
+
+def _drop_unusable_values(obj, path):
+    """Remove dict entries holding NaN/Infinity or null, so schema defaults apply.
+
+    orjson would save non-finite floats as null, which the schema then
+    rejects on the next start, so they are never let through.
+    """
+    if isinstance(obj, dict):
+        for key in [k for k, v in obj.items() if v is _NON_FINITE or v is None]:
+            logger.warning("Ignoring invalid value for %r in %s; using the default", key, path)
+            del obj[key]
+        for value in obj.values():
+            _drop_unusable_values(value, path)
+    elif isinstance(obj, list):
+        for value in obj:
+            _drop_unusable_values(value, path)
+
+
+def _merge_validated(original, validated):
+    """Write schema-checked values back into the parsed JSON they came from.
+
+    Keys the schema doesn't know are kept at every level, and integers the
+    schema widened to float keep their original type.
+    """
+    if isinstance(original, dict) and isinstance(validated, dict):
+        for key, value in validated.items():
+            original[key] = _merge_validated(original.get(key), value)
+        return original
+    if isinstance(original, list) and isinstance(validated, list) and len(original) == len(validated):
+        return [_merge_validated(o, v) for o, v in zip(original, validated)]
+    if type(original) is int and isinstance(validated, float) and original == validated:
+        return original
+    return validated
+
+
+def _validate(data, schema, path):
+    """Check parsed JSON against a msgspec.Struct schema and fill in defaults.
+
+    The schema is only used for checking and defaults: the result is the
+    parsed data itself, so keys it doesn't know survive the next save.
+    Raises msgspec.ValidationError naming the offending field.
+    """
+    _drop_unusable_values(data, path)
+    return _merge_validated(data, msgspec.to_builtins(msgspec.convert(data, schema)))
+
+
+def _cached_json_load(path, schema=None):
+    """Load a JSON file, reusing the previous parse if the file is unchanged.
+
+    If schema is a msgspec.Struct type the file is validated against it and
+    missing or invalid (NaN, Infinity, null) fields get their defaults; a
+    value of the wrong type raises msgspec.ValidationError. The result is
+    still plain dicts/lists. Returns a deep copy so callers are free
+    to mutate the result.
+    """
+    st = os.stat(path)
+    cached = _json_cache.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return copy.deepcopy(cached[2])
+
+    with open(path, 'rb') as f:
+        raw = f.read()
+    try:
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Hand-edited files may use things orjson rejects (e.g. NaN)
+        data = json.loads(raw, parse_constant=lambda _: _NON_FINITE)
+    if schema is not None:
+        data = _validate(data, schema, path)
+    _json_cache[path] = (st.st_mtime_ns, st.st_size, data)
+    return copy.deepcopy(data)
+
+
+def _mkstemp_for(path):
+    """Create a uniquely named temp file next to path; returns (fd, tmp_path).
+
+    Each write gets its own temp file, so overlapping saves of the same file
+    can never publish each other's half-written data.
+    """
+    return tempfile.mkstemp(
+        dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp'
+    )
+
+
+def _write_json(path, obj, option=None):
+    """Atomically serialize obj to path as JSON."""
+    fd, tmp_path = _mkstemp_for(path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _price_poll_interval(current_price, take_profit_price, take_profit_distance):
+    """Seconds to wait before the next price check for a monitored token.
+
+    take_profit_distance is the configured take profit as a fraction (0.3 for
+    30%). Polls every minute until the price is more than
+    PRICE_POLL_BACKOFF_START times that distance below the target, so a fresh
+    position is always watched closely, then backs off towards
+    MAX_PRICE_POLL_INTERVAL the further away it is.
+    """
+    if current_price <= 0 or take_profit_distance <= 0:
+        # Price lookup failed, or no meaningful distance; retry soon
+        return MIN_PRICE_POLL_INTERVAL
+    distance = take_profit_price / current_price - 1
+    backoff = distance / (PRICE_POLL_BACKOFF_START * take_profit_distance)
+    return max(MIN_PRICE_POLL_INTERVAL, min(MAX_PRICE_POLL_INTERVAL, MIN_PRICE_POLL_INTERVAL * backoff))
+
+
+def _safe_private_key(wallet):
+    """Return the masked private key for display, computing it once per wallet."""
+    safe = wallet.get('_safe_pk')
+    if safe is None:
+        private_key = wallet['private_key']
+        safe = wallet['_safe_pk'] = f"{private_key[:5]}...{private_key[-5:]}"
+    return safe
+
+
+def _public_fields(wallet):
+    """Drop in-memory helper fields (prefixed with '_') before persisting a wallet."""
+    return {k: v for k, v in wallet.items() if not k.startswith('_')}
+
+
+# Per-path locks so async saves of one file land in the order they were started
+_write_locks = defaultdict(asyncio.Lock)
+
+
+async def _write_file_async(path, data):
+    """Atomically write bytes to path without blocking the event loop."""
+    async with _write_locks[path]:
+        fd, tmp_path = _mkstemp_for(path)
+        os.close(fd)
+        try:
+            async with aiofiles.open(tmp_path, 'wb') as f:
+                await f.write(data)
+            await asyncio.to_thread(os.replace, tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
 class TradingBot:
+    # Notification templates for process_new_ca
+    NEW_TOKEN_TMPL = (
+        "🔍 *New Token Detected*\n\n"
+        "Token Address: `{token}`\n"
+        "Found in: {group}"
+    )
+    TRADE_SKIPPED_TMPL = (
+        "ℹ️ *Trading Skipped*\n\n"
+        "Token: `{token}`\n"
+        "Reason: Already traded recently"
+    )
+    NEW_TRADE_TMPL = (
+        "🚀 *New Token Trade*\n\n"
+        "Token: `{token}`\n"
+        "Group: {group}\n"
+        "Amount: {investment} SOL\n"
+        "Tokens purchased: {amount}\n"
+        "Entry price: {price} SOL per token\n\n"
+        "Now monitoring for take profit at {take_profit}%"
+    )
+    TRADE_FAILED_TMPL = (
+        "⚠️ *Trade Failed*\n\n"
+        "Token: `{token}`\n"
+        "Group: {group}\n"
+        "Error: {error}"
+    )
+
+    # Notification templates for monitor_token_price
+    TAKE_PROFIT_TMPL = (
+        "💰 *Take Profit Executed*\n\n"
+        "Token: `{token}`\n"
+        "Sold: {sold} tokens ({sell_percentage}% of position)\n"
+        "Entry price: {entry_price} SOL\n"
+        "Exit price: {exit_price} SOL\n"
+        "Profit: {profit:.4f} SOL ({profit_percentage:.2f}%)"
+    )
+    TAKE_PROFIT_FAILED_TMPL = (
+        "⚠️ *Take Profit Failed*\n\n"
+        "Token: `{token}`\n"
+        "Error: {error}"
+    )
+
     def __init__(self):
-        # Load credentials
-        self.credentials = self._load_credentials()
-        self.wallet_info = self._load_wallet_info()
-        self.monitored_groups = self._load_monitored_groups()
-        self.trading_settings = self._load_trading_settings()
-        self._load_chat_id()
-        self.wallets = self._load_wallets()
-            # If we have a wallet_info but no wallets yet, migrate it
+        # Config and components are loaded/built in async_setup()
+        self.credentials = None
+        self.wallet_info = None
+        # Monitored group links; a dict used as an insertion-ordered set
+        self.monitored_groups = {}
+        self.trading_settings = None
+        # Take profit price multiplier and fraction of a position to sell,
+        # derived from trading_settings by _update_take_profit_factors()
+        self._tp_mult = 1.0
+        self._sell_frac = 0.0
+        # Traded token address -> buy time (epoch seconds), oldest first
+        self._traded_tokens = {}
+        # Lines currently in traded_tokens.log, live or not
+        self._traded_log_lines = 0
+        # Serializes appends and rewrites of traded_tokens.log
+        self._traded_log_lock = asyncio.Lock()
+        # Chat that receives notifications; set by /start, None until then
+        self.user_chat_id: int | None = None
+        self.wallets = None
+        self.solana_trader = None
+        self.telegram_listener = None
+        self.telegram_bot = None
+
+        # Debounced writes: pending save coroutine functions and their flush tasks
+        self._dirty_saves = set()
+        self._save_tasks = {}
+
+        # Detected CAs are processed in background tasks; the per-group lock keeps
+        # one group's CAs in order while different groups run concurrently
+        self._group_locks = defaultdict(asyncio.Lock)
+        self._ca_tasks = set()
+        # CAs with a buy in flight, so the same CA posted in two groups is bought once
+        self._buys_in_progress = set()
+
+        # Running take profit monitors: token -> task, and the semaphore that
+        # bounds how many of them talk to the RPC/Jupiter at once
+        self._monitors = {}
+        self._monitor_sem = asyncio.Semaphore(MAX_CONCURRENT_MONITOR_CHECKS)
+
+        # Outgoing notifications as (chat_id, message), drained by _notify_worker
+        self._notify_q = asyncio.Queue()
+        self._notify_task = None
+        # chat_id -> loop time of the last notification sent there, for pacing
+        self._notify_last_sent = {}
+
+        # chat_id -> loop time of the last error reply sent there
+        self._last_err_reply = {}
+
+        # Static menus never change, so build their markups once
+        self._MAIN_MENU = InlineKeyboardMarkup([
+            [InlineKeyboardButton("Manage Wallets", callback_data='manage_wallets')],
+            [InlineKeyboardButton("Create Wallet", callback_data='create_wallet')],
+            [InlineKeyboardButton("Wallet Info", callback_data='wallet_info')],
+            [InlineKeyboardButton("Manage Groups", callback_data='manage_groups')],
+            [InlineKeyboardButton("Trading Settings", callback_data='trading_settings')],
+            [InlineKeyboardButton("Help", callback_data='help')]
+        ])
+        self._MANAGE_GROUPS_MARKUP = InlineKeyboardMarkup([
+            [InlineKeyboardButton("Add Group", callback_data='add_group')],
+            [InlineKeyboardButton("Remove Group", callback_data='remove_group')],
+            [InlineKeyboardButton("List Groups", callback_data='list_groups')],
+            [InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]
+        ])
+        self._TRADING_SETTINGS_MARKUP = InlineKeyboardMarkup([
+            [InlineKeyboardButton("Set Investment", callback_data='set_investment_prompt')],
+            [InlineKeyboardButton("Set Take Profit", callback_data='set_take_profit_prompt')],
+            [InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]
+        ])
+        self._BACK_TO_MAIN_MARKUP = InlineKeyboardMarkup([
+            [InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]
+        ])
+        self._back_to_groups_button = InlineKeyboardButton("Back", callback_data='manage_groups')
+        self._BACK_TO_GROUPS_MARKUP = InlineKeyboardMarkup([[self._back_to_groups_button]])
+
+        # Wallet selection keyboards, keyed by compact flag -> ((count, active index), markup)
+        self._wallet_kb_cache = {}
+        self._wallet_kb_footer = (
+            [InlineKeyboardButton("➕ Create New Wallet", callback_data="create_wallet")],
+            [InlineKeyboardButton("🔙 Back to Main Menu", callback_data="main_menu")],
+        )
+
+        # Group removal keyboards, keyed by with_back flag -> (groups version, markup);
+        # the version is bumped whenever monitored_groups is saved
+        self._groups_version = 0
+        self._remove_kb_cache = {}
+
+        # Callback query dispatch: exact callback_data first, then prefixed ones
+        self._callback_handlers = {
+            'create_wallet': self._cb_create_wallet,
+            'wallet_info': self._cb_wallet_info,
+            'manage_wallets': self.manage_wallets,
+            'manage_groups': self._cb_manage_groups,
+            'trading_settings': self._cb_trading_settings,
+            'help': self._cb_help,
+            'main_menu': self._cb_main_menu,
+            'add_group': self._cb_add_group,
+            'remove_group': self._cb_remove_group,
+            'list_groups': self._cb_list_groups,
+            'set_investment_prompt': self._cb_set_investment_prompt,
+            'set_take_profit_prompt': self._cb_set_take_profit_prompt,
+        }
+        self._callback_prefix_handlers = (
+            ('select_wallet_', self._cb_select_wallet),
+            ('remove_', self._cb_remove_group_item),
+        )
+
+    async def async_setup(self):
+        """Load all config files concurrently, then build the bot components."""
+        (
+            self.credentials,
+            self.wallet_info,
+            self.monitored_groups,
+            self.trading_settings,
+            self.user_chat_id,
+            self.wallets,
+            (self._traded_tokens, stale_log_lines),
+        ) = await asyncio.gather(
+            asyncio.to_thread(self._load_credentials),
+            asyncio.to_thread(self._load_wallet_info),
+            asyncio.to_thread(self._load_monitored_groups),
+            asyncio.to_thread(self._load_trading_settings),
+            asyncio.to_thread(self._load_chat_id),
+            asyncio.to_thread(self._load_wallets),
+            asyncio.to_thread(self._load_traded_tokens),
+        )
+        self._update_take_profit_factors()
+
+        # Older versions kept traded tokens inside trading_settings.json
+        legacy_tokens = self.trading_settings.pop('traded_tokens', [])
+        if legacy_tokens:
+            now = time.time()
+            for token in legacy_tokens:
+                self._traded_tokens.setdefault(token, now)
+            # Not in the log yet; force the rewrite below
+            stale_log_lines += 1
+            await self._save_trading_settings()
+
+        # Drop tokens whose cooldown passed while we were down and rewrite the
+        # log if it has anything that shouldn't be there
+        self._traded_log_lines = len(self._traded_tokens) + stale_log_lines
+        self._evict_expired_traded_tokens()
+        if self._traded_log_lines > len(self._traded_tokens):
+            await self._compact_traded_tokens_log()
+
+        # If we have a wallet_info but no wallets yet, migrate it
         if self.wallet_info and not self.wallets['wallets']:
             self.wallet_info['name'] = "Wallet 1"
             self.wallets['wallets'].append(self.wallet_info)
             self.wallets['active_wallet_index'] = 0
-            self._save_wallets()
+            await self._save_wallets()
+
+        # Without credentials nothing can start; stop before paying for the
+        # telethon and solana imports below
+        missing = [key for key in ('api_id', 'api_hash', 'bot_token') if not self.credentials.get(key)]
+        if missing:
+            logger.error("credentials.txt is missing %s", ", ".join(missing))
+            raise SystemExit(1)
+
+        # Imported here, after the checks above; a normal start loads them anyway
+        from solana_trader import SolanaTrader
+        from telegram_listener import TelegramListener
+
         # Initialize components
         self.solana_trader = SolanaTrader(self.wallet_info, self.trading_settings)
         
@@ -46,22 +524,23 @@ class TradingBot:
             api_id=self.credentials['api_id'],
             api_hash=self.credentials['api_hash'],
             bot_token=self.credentials['bot_token'],
-            callback=self.process_new_ca
+            callback=self._dispatch_new_ca
         )
-        
+
         # Initialize the telegram bot
-        self.telegram_bot = Application.builder().token(self.credentials['bot_token']).build()
+        self.telegram_bot = (
+            Application.builder()
+            .token(self.credentials['bot_token'])
+            .concurrent_updates(256)
+            .request(HTTPXRequest(connection_pool_size=64, pool_timeout=10))
+            .build()
+        )
         self._setup_handlers()
 
     def _load_credentials(self):
         try:
             with open('credentials.txt', 'r') as f:
-                creds = {}
-                for line in f:
-                    if '=' in line:
-                        key, value = line.strip().split('=', 1)
-                        creds[key.strip()] = value.strip().strip("'").strip('"')
-                return creds
+                return {key: value for key, _, value in _CRED_RE.findall(f.read())}
         except FileNotFoundError:
             logger.error("Credentials file not found. Please create a credentials.txt file.")
             return {
@@ -72,101 +551,208 @@ class TradingBot:
 
     def _load_wallet_info(self):
         try:
-            with open('wallet_credentials.txt', 'r') as f:
-                return json.load(f)
+            return _cached_json_load('wallet_credentials.txt')
         except (FileNotFoundError, json.JSONDecodeError):
             return None
 
-    def _save_wallet_info(self, wallet_info):
-        with open('wallet_credentials.txt', 'w') as f:
-            json.dump(wallet_info, f)
+    async def _save_wallet_info(self, wallet_info):
+        await _write_file_async('wallet_credentials.txt', orjson.dumps(_public_fields(wallet_info)))
         self.wallet_info = wallet_info
 
     def _load_monitored_groups(self):
         try:
             with open('monitored_groups.txt', 'r') as f:
-                return [line.strip() for line in f if line.strip()]
+                return dict.fromkeys(line.strip() for line in f if line.strip())
         except FileNotFoundError:
-            return []
+            return {}
 
-    def _save_monitored_groups(self):
-        with open('monitored_groups.txt', 'w') as f:
-            for group in self.monitored_groups:
-                f.write(f"{group}\n")
+    async def _save_monitored_groups(self):
+        self._groups_version += 1
+        data = "".join(f"{group}\n" for group in self.monitored_groups)
+        await _write_file_async('monitored_groups.txt', data.encode('utf-8'))
 
     def _load_trading_settings(self):
         try:
-            with open('trading_settings.json', 'r') as f:
-                return json.load(f)
+            return _cached_json_load('trading_settings.json', TradingSettings)
+        except msgspec.ValidationError as e:
+            logger.error("Invalid trading_settings.json: %s. Fix or delete the file and restart.", e)
+            raise SystemExit(1)
         except (FileNotFoundError, json.JSONDecodeError):
             # Default settings
-            default_settings = {
-                'initial_investment': 0.1,  # SOL
-                'take_profit_percentage': 30,  # %
-                'sell_percentage': 50,  # %
-                'max_slippage': 1,  # %
-                'traded_tokens': []  # List of already traded token addresses
-            }
-            with open('trading_settings.json', 'w') as f:
-                json.dump(default_settings, f)
+            default_settings = msgspec.to_builtins(TradingSettings())
+            _write_json('trading_settings.json', default_settings, SETTINGS_JSON_OPTIONS)
             return default_settings
 
+    def _update_take_profit_factors(self):
+        """Recompute the take profit multipliers after trading_settings changed."""
+        self._tp_mult = 1 + self.trading_settings['take_profit_percentage'] / 100
+        self._sell_frac = self.trading_settings['sell_percentage'] / 100
+
+    def _load_traded_tokens(self):
+        """Load traded tokens as address -> buy time, oldest first.
+
+        Also returns how many log lines are stale: duplicates, malformed
+        lines (skipped), and lines from before buy times were logged, which
+        count as bought now.
+        """
+        tokens = {}
+        stale = 0
+        now = time.time()
+        try:
+            with open('traded_tokens.log', 'r') as f:
+                for line in f:
+                    address, _, bought_at = line.strip().partition('\t')
+                    if not address:
+                        continue
+                    try:
+                        buy_time = float(bought_at) if bought_at else now
+                    except ValueError:
+                        logger.warning("Skipping malformed line in traded_tokens.log: %r", line)
+                        stale += 1
+                        continue
+                    if address in tokens or not bought_at:
+                        stale += 1
+                    tokens[address] = buy_time
+        except FileNotFoundError:
+            pass
+        return dict(sorted(tokens.items(), key=lambda item: item[1])), stale
+
+    def _evict_expired_traded_tokens(self):
+        """Forget traded tokens whose cooldown has passed."""
+        cutoff = time.time() - self.trading_settings['cooldown_seconds']
+        tokens = self._traded_tokens
+        # Entries are in buy order, so expired ones are at the front
+        while tokens:
+            oldest = next(iter(tokens))
+            if tokens[oldest] > cutoff:
+                break
+            del tokens[oldest]
+
+    async def _append_traded_tokens(self, entries):
+        """Log traded tokens (address -> buy time) already added to _traded_tokens.
+
+        Appends to traded_tokens.log, or rewrites it when expired entries
+        have come to dominate it.
+        """
+        if not entries:
+            return
+        async with self._traded_log_lock:
+            self._traded_log_lines += len(entries)
+            self._evict_expired_traded_tokens()
+            if self._traded_log_lines > 2 * len(self._traded_tokens) + TRADED_LOG_COMPACT_SLACK:
+                await self._rewrite_traded_tokens_log()
+                return
+            async with aiofiles.open('traded_tokens.log', 'a') as f:
+                await f.write("".join(f"{address}\t{bought_at}\n" for address, bought_at in entries.items()))
+
+    async def _compact_traded_tokens_log(self):
+        """Rewrite traded_tokens.log with just the tokens still in cooldown."""
+        async with self._traded_log_lock:
+            await self._rewrite_traded_tokens_log()
+
+    async def _rewrite_traded_tokens_log(self):
+        # Caller holds _traded_log_lock
+        data = "".join(f"{address}\t{bought_at}\n" for address, bought_at in self._traded_tokens.items())
+        self._traded_log_lines = len(self._traded_tokens)
+        await _write_file_async('traded_tokens.log', data.encode('utf-8'))
+
     def _load_wallets(self):
         """Load all saved wallets."""
         try:
-            with open('wallets.json', 'r') as f:
-                return json.load(f)
+            return _cached_json_load('wallets.json', WalletStore)
+        except msgspec.ValidationError as e:
+            # Never fall back to an empty store here; the next save would erase the wallets
+            logger.error("Invalid wallets.json: %s. Fix the file and restart.", e)
+            raise SystemExit(1)
         except (FileNotFoundError, json.JSONDecodeError):
             # Initialize with empty list
-            wallets = {'wallets': [], 'active_wallet_index': -1}
-            with open('wallets.json', 'w') as f:
-                json.dump(wallets, f)
+            wallets = msgspec.to_builtins(WalletStore())
+            _write_json('wallets.json', wallets)
             return wallets
 
-    def _save_wallets(self):
+    async def _save_wallets(self):
         """Save all wallets to file."""
-        with open('wallets.json', 'w') as f:
-            json.dump(self.wallets, f)
+        wallets = dict(self.wallets)
+        wallets['wallets'] = [_public_fields(w) for w in wallets['wallets']]
+        await _write_file_async('wallets.json', orjson.dumps(wallets))
+
+    def _schedule_save_wallets(self):
+        """Save wallets soon, coalescing with other saves in the same window."""
+        self._schedule_save(self._save_wallets)
+
+    def _schedule_save_trading_settings(self):
+        """Save trading settings soon, coalescing with other saves in the same window."""
+        self._schedule_save(self._save_trading_settings)
+
+    def _schedule_save(self, save):
+        """Mark a file dirty and make sure a flush is pending for it."""
+        self._dirty_saves.add(save)
+        if save not in self._save_tasks:
+            self._save_tasks[save] = asyncio.create_task(
+                self._flush_after(save, SAVE_DEBOUNCE_DELAY)
+            )
+
+    async def _flush_after(self, save, delay):
+        """Write a dirty file once per debounce window until it stays clean."""
+        try:
+            while save in self._dirty_saves:
+                await asyncio.sleep(delay)
+                self._dirty_saves.discard(save)
+                await save()
+        except Exception as e:
+            logger.error("Error saving %s: %s", save.__name__, e)
+        finally:
+            del self._save_tasks[save]
+
+    async def _flush_pending_saves(self):
+        """Wait for all debounced writes to land, e.g. before shutting down."""
+        while self._save_tasks:
+            await asyncio.gather(*self._save_tasks.values(), return_exceptions=True)
 
     def _get_active_wallet(self):
         """Get the currently active wallet."""
-        if self.wallets['active_wallet_index'] >= 0 and len(self.wallets['wallets']) > self.wallets['active_wallet_index']:
-            return self.wallets['wallets'][self.wallets['active_wallet_index']]
+        index = self.wallets['active_wallet_index']
+        wallets = self.wallets['wallets']
+        if 0 <= index < len(wallets):
+            return wallets[index]
         return None
 
-    def _save_trading_settings(self):
-        with open('trading_settings.json', 'w') as f:
-            json.dump(self.trading_settings, f)
+    async def _save_trading_settings(self):
+        await _write_file_async(
+            'trading_settings.json',
+            orjson.dumps(self.trading_settings, option=SETTINGS_JSON_OPTIONS)
+        )
             
     def _load_chat_id(self):
         """Load the stored chat ID if it exists."""
         try:
             with open('chat_id.txt', 'r') as f:
-                self.user_chat_id = int(f.read().strip())
+                return int(f.read().strip())
         except FileNotFoundError:
             logger.warning("No stored chat ID found. User needs to start the bot first.")
-            self.user_chat_id = None
+            return None
 
     def _setup_handlers(self):
-        # Command handlers
-        self.telegram_bot.add_handler(CommandHandler("start", self.start))
-        self.telegram_bot.add_handler(CommandHandler("help", self.help_command))
-        self.telegram_bot.add_handler(CommandHandler("create_wallet", self.create_wallet))
-        self.telegram_bot.add_handler(CommandHandler("wallet_info", self.wallet_info_command))
-        self.telegram_bot.add_handler(CommandHandler("withdraw", self.withdraw))
-        self.telegram_bot.add_handler(CommandHandler("add_group", self.add_group))
-        self.telegram_bot.add_handler(CommandHandler("remove_group", self.remove_group))
-        self.telegram_bot.add_handler(CommandHandler("list_groups", self.list_groups))
-        self.telegram_bot.add_handler(CommandHandler("settings", self.show_settings))
-        self.telegram_bot.add_handler(CommandHandler("set_investment", self.set_investment))
-        self.telegram_bot.add_handler(CommandHandler("set_take_profit", self.set_take_profit))
-        self.telegram_bot.add_handler(CommandHandler("manage_wallets", self.manage_wallets))
-        self.telegram_bot.add_handler(CommandHandler("manage_wallets", self.manage_wallets_command))
+        # Command handlers (non-blocking, so a slow RPC in one handler
+        # doesn't hold up updates for everyone else)
+        self.telegram_bot.add_handler(CommandHandler("start", self.start, block=False))
+        self.telegram_bot.add_handler(CommandHandler("help", self.help_command, block=False))
+        self.telegram_bot.add_handler(CommandHandler("create_wallet", self.create_wallet, block=False))
+        self.telegram_bot.add_handler(CommandHandler("wallet_info", self.wallet_info_command, block=False))
+        self.telegram_bot.add_handler(CommandHandler("withdraw", self.withdraw, block=False))
+        self.telegram_bot.add_handler(CommandHandler("add_group", self.add_group, block=False))
+        self.telegram_bot.add_handler(CommandHandler("remove_group", self.remove_group, block=False))
+        self.telegram_bot.add_handler(CommandHandler("list_groups", self.list_groups, block=False))
+        self.telegram_bot.add_handler(CommandHandler("settings", self.show_settings, block=False))
+        self.telegram_bot.add_handler(CommandHandler("set_investment", self.set_investment, block=False))
+        self.telegram_bot.add_handler(CommandHandler("set_take_profit", self.set_take_profit, block=False))
+        self.telegram_bot.add_handler(CommandHandler("manage_wallets", self.manage_wallets, block=False))
+        self.telegram_bot.add_handler(CommandHandler("manage_wallets", self.manage_wallets_command, block=False))
         # Callback query handler
-        self.telegram_bot.add_handler(CallbackQueryHandler(self.button_handler))
+        self.telegram_bot.add_handler(CallbackQueryHandler(self.button_handler, block=False))
         
         # Conversation handlers for more complex flows
-        self.telegram_bot.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.text_handler))
+        self.telegram_bot.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.text_handler, block=False))
         
         # Error handler
         self.telegram_bot.add_error_handler(self.error_handler)
@@ -183,52 +769,18 @@ class TradingBot:
             with open('chat_id.txt', 'w') as f:
                 f.write(str(self.user_chat_id))
         except Exception as e:
-            logger.error(f"Error saving chat ID: {str(e)}")
+            logger.error("Error saving chat ID: %s", e)
         
         welcome_text = (
             f"Hi {user.first_name}! I'm your Solana Trading Bot.\n\n"
             "I can monitor Telegram groups for new Solana tokens and trade them automatically."
         )
         
-        keyboard = [
-            [InlineKeyboardButton("Manage Wallets", callback_data='manage_wallets')],
-            [InlineKeyboardButton("Create Wallet", callback_data='create_wallet')],
-            [InlineKeyboardButton("Wallet Info", callback_data='wallet_info')],
-            [InlineKeyboardButton("Manage Groups", callback_data='manage_groups')],
-            [InlineKeyboardButton("Trading Settings", callback_data='trading_settings')],
-            [InlineKeyboardButton("Help", callback_data='help')]
-        ]
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(welcome_text, reply_markup=reply_markup)
+        await update.message.reply_text(welcome_text, reply_markup=self._MAIN_MENU)
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Send a message when the command /help is issued."""
-        help_text = (
-            "🤖 *Solana Trading Bot Commands* 🤖\n\n"
-            "*Wallet Commands:*\n"
-            "/create_wallet - Generate a new Solana wallet\n"
-            "/wallet_info - Display your current wallet info\n"
-            "/withdraw <amount> <address> - Withdraw funds to another wallet\n\n"
-            
-            "*Group Management:*\n"
-            "/add_group <group_link> - Add a Telegram group to monitor\n"
-            "/remove_group - Shows a list of groups to remove\n"
-            "/list_groups - List all monitored groups\n\n"
-            
-            "*Trading Settings:*\n"
-            "/settings - View current trading settings\n"
-            "/set_investment <amount> - Set initial investment amount in SOL\n"
-            "/set_take_profit <profit_percentage> <sell_percentage> - Set take profit conditions\n"
-            "Example: /set_take_profit 30 50 - Sell 50% when profit reaches 30%\n\n"
-            
-            "*Other Commands:*\n"
-            "/start - Show the main menu\n"
-            "/help - Display this help message"
-        )
-        
-        await update.message.reply_text(help_text, parse_mode='Markdown')
+        await update.message.reply_text(_HELP_TEXT_CMD, parse_mode='Markdown')
 
     async def create_wallet(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Create a new Solana wallet."""
@@ -246,15 +798,14 @@ class TradingBot:
             self.wallets['active_wallet_index'] = len(self.wallets['wallets']) - 1
                         
             # Save wallets
-            self._save_wallets()
+            await self._save_wallets()
             
             # Update trader's wallet info
             self.solana_trader.wallet_info = new_wallet
             self.wallet_info = new_wallet  # For backward compatibility
             
             # Only show part of the private key for security
-            private_key = new_wallet['private_key']
-            safe_private_key = f"{private_key[:5]}...{private_key[-5:]}"
+            safe_private_key = _safe_private_key(new_wallet)
             
             response = (
                 "✅ New wallet created successfully!\n\n"
@@ -267,26 +818,39 @@ class TradingBot:
         
         await update.message.reply_text(response, parse_mode='Markdown')
 
+    def _build_wallet_keyboard(self, compact=False):
+        """Build the wallet selection keyboard, reusing it while the wallet list is unchanged.
+
+        The compact variant omits the public key prefix from each button.
+        """
+        wallets = self.wallets['wallets']
+        active_index = self.wallets['active_wallet_index']
+        key = (len(wallets), active_index)
+
+        cached = self._wallet_kb_cache.get(compact)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        keyboard = [
+            [InlineKeyboardButton(
+                f"{'✅ ' if i == active_index else ''}{wallet['name']}"
+                + ("" if compact else f" ({wallet['public_key'][:6]}...)"),
+                callback_data=f"select_wallet_{i}"
+            )]
+            for i, wallet in enumerate(wallets)
+        ]
+        keyboard.append(self._wallet_kb_footer[0])
+        keyboard.append(self._wallet_kb_footer[1])
+
+        markup = InlineKeyboardMarkup(keyboard)
+        self._wallet_kb_cache[compact] = (key, markup)
+        return markup
+
     async def manage_wallets(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         query = update.callback_query
         await query.answer()
 
-        keyboard = []
-        
-        # Add button for each wallet
-        for i, wallet in enumerate(self.wallets['wallets']):
-            wallet_name = wallet.get('name', f"Wallet {i+1}")
-            active_marker = "✅ " if i == self.wallets['active_wallet_index'] else ""
-            keyboard.append([InlineKeyboardButton(
-                f"{active_marker}{wallet_name} ({wallet['public_key'][:6]}...)", 
-                callback_data=f"select_wallet_{i}"
-            )])
-        
-        # Add button to create new wallet
-        keyboard.append([InlineKeyboardButton("➕ Create New Wallet", callback_data="create_wallet")])
-        keyboard.append([InlineKeyboardButton("🔙 Back to Main Menu", callback_data="main_menu")])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._build_wallet_keyboard()
         
         await query.edit_message_text(
             "🔑 *Wallet Management*\n\n"
@@ -298,22 +862,7 @@ class TradingBot:
     
     async def manage_wallets_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Show wallet management options from command."""
-        keyboard = []
-        
-        # Add button for each wallet
-        for i, wallet in enumerate(self.wallets['wallets']):
-            wallet_name = wallet.get('name', f"Wallet {i+1}")
-            active_marker = "✅ " if i == self.wallets['active_wallet_index'] else ""
-            keyboard.append([InlineKeyboardButton(
-                f"{active_marker}{wallet_name}", 
-                callback_data=f"select_wallet_{i}"
-            )])
-        
-        # Add button to create new wallet
-        keyboard.append([InlineKeyboardButton("➕ Create New Wallet", callback_data="create_wallet")])
-        keyboard.append([InlineKeyboardButton("🔙 Back to Main Menu", callback_data="main_menu")])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._build_wallet_keyboard(compact=True)
         
         await update.message.reply_text(
             "🔑 *Wallet Management*\n\nSelect a wallet to use or create a new one:",
@@ -333,8 +882,7 @@ class TradingBot:
         balance = await self.solana_trader.get_balance()
         
         # Only show part of the private key for security
-        private_key = self.wallet_info['private_key']
-        safe_private_key = f"{private_key[:5]}...{private_key[-5:]}"
+        safe_private_key = _safe_private_key(self.wallet_info)
         
         response = (
             "🔑 *Wallet Information*\n\n"
@@ -408,8 +956,8 @@ class TradingBot:
         
         # Add to the list if not already there
         if group_link not in self.monitored_groups:
-            self.monitored_groups.append(group_link)
-            self._save_monitored_groups()
+            self.monitored_groups[group_link] = None
+            await self._save_monitored_groups()
             
             # Add the listener for this group
             await self.telegram_listener.add_group(group_link)
@@ -420,17 +968,39 @@ class TradingBot:
         
         await update.message.reply_text(response)
 
+    def _build_remove_group_keyboard(self, with_back=False):
+        """Build the group removal keyboard, reusing it until the group list is saved again."""
+        cached = self._remove_kb_cache.get(with_back)
+        if cached and cached[0] == self._groups_version:
+            return cached[1]
+
+        keyboard = []
+        for group in self.monitored_groups:
+            keyboard.append([InlineKeyboardButton(group, callback_data=f"remove_{group}")])
+
+        if with_back:
+            keyboard.append([self._back_to_groups_button])
+
+        markup = InlineKeyboardMarkup(keyboard)
+        self._remove_kb_cache[with_back] = (self._groups_version, markup)
+        return markup
+
+    def _groups_list_text(self):
+        """Monitored groups as MarkdownV2, with the group links escaped."""
+        if not self.monitored_groups:
+            return escape_markdown("⚠️ No groups are currently being monitored.", version=2)
+        return "📋 *Monitored Groups:*\n\n" + "\n".join(
+            f"{i}\\. {escape_markdown(group, version=2)}"
+            for i, group in enumerate(self.monitored_groups, 1)
+        )
+
     async def remove_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Show groups to remove with inline buttons."""
         if not self.monitored_groups:
             await update.message.reply_text("❌ No groups are currently being monitored.")
             return
         
-        keyboard = []
-        for group in self.monitored_groups:
-            keyboard.append([InlineKeyboardButton(group, callback_data=f"remove_{group}")])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = self._build_remove_group_keyboard()
         
         await update.message.reply_text(
             "Select a group to remove:",
@@ -443,11 +1013,7 @@ class TradingBot:
             await update.message.reply_text("⚠️ No groups are currently being monitored.")
             return
         
-        response = "📋 *Monitored Groups:*\n\n"
-        for i, group in enumerate(self.monitored_groups, 1):
-            response += f"{i}. {group}\n"
-        
-        await update.message.reply_text(response, parse_mode='Markdown')
+        await update.message.reply_text(self._groups_list_text(), parse_mode='MarkdownV2')
 
     async def show_settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Show current trading settings."""
@@ -459,18 +1025,10 @@ class TradingBot:
             f"Take Profit: {settings['take_profit_percentage']}%\n"
             f"Sell Percentage: {settings['sell_percentage']}%\n"
             f"Max Slippage: {settings['max_slippage']}%\n\n"
-            f"Tokens Traded: {len(settings['traded_tokens'])}"
+            f"Tokens in Cooldown: {len(self._traded_tokens)}"
         )
         
-        keyboard = [
-            [InlineKeyboardButton("Set Investment", callback_data='set_investment')],
-            [InlineKeyboardButton("Set Take Profit", callback_data='set_take_profit')],
-            [InlineKeyboardButton("Main Menu", callback_data='main_menu')]
-        ]
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(response, reply_markup=reply_markup, parse_mode='Markdown')
+        await update.message.reply_text(response, reply_markup=self._TRADING_SETTINGS_MARKUP, parse_mode='Markdown')
 
     async def set_investment(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Set the initial investment amount."""
@@ -489,7 +1047,7 @@ class TradingBot:
                 return
             
             self.trading_settings['initial_investment'] = amount
-            self._save_trading_settings()
+            self._schedule_save_trading_settings()
             
             await update.message.reply_text(f"✅ Initial investment amount set to {amount} SOL.")
             
@@ -518,7 +1076,8 @@ class TradingBot:
             
             self.trading_settings['take_profit_percentage'] = profit_percentage
             self.trading_settings['sell_percentage'] = sell_percentage
-            self._save_trading_settings()
+            self._update_take_profit_factors()
+            self._schedule_save_trading_settings()
             
             await update.message.reply_text(
                 f"✅ Take profit settings updated:\n"
@@ -532,225 +1091,185 @@ class TradingBot:
         query = update.callback_query
         await query.answer()
     
-        callback_data = query.data
-    
-                # In button_handler method
-            # In button_handler method
-        if callback_data == 'create_wallet':
-            # Create new wallet
-            wallet_info = self.solana_trader.create_new_wallet()
-            
-            if wallet_info:
-                # Add name to wallet info
-                wallet_info['name'] = f"Wallet {len(self.wallets['wallets']) + 1}"
-                
-                # Add to wallets list
-                self.wallets['wallets'].append(wallet_info)
-                
-                # Set as active wallet if this is the first wallet
-                if len(self.wallets['wallets']) == 1:
-                    self.wallets['active_wallet_index'] = 0
-                
-                # Save wallets
-                self._save_wallets()
-                
-                # Update trader's wallet info to use the active wallet
-                self.solana_trader.wallet_info = self._get_active_wallet()
-                
-                # Only show part of the private key for security
-                private_key = wallet_info['private_key']
-                safe_private_key = f"{private_key[:5]}...{private_key[-5:]}"
-                
-                response = (
-                    "✅ New wallet created successfully!\n\n"
-                    f"🔑 Public Address: {wallet_info['public_key']}\n\n"
-                    f"🔐 Private Key: {safe_private_key}\n\n"
-                    f"Total Wallets: {len(self.wallets['wallets'])}\n"
-                    "Use 'Manage Wallets' to switch between wallets."
-                )
+        # Interned so the dispatch lookup below can match keys by identity
+        callback_data = sys.intern(query.data)
+
+        handler = self._callback_handlers.get(callback_data)
+        if handler:
+            await handler(update, context)
+            return
+
+        for prefix, handler in self._callback_prefix_handlers:
+            if callback_data.startswith(prefix):
+                await handler(update, context, callback_data[len(prefix):])
+                return
+
+    async def _cb_create_wallet(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+
+        # Create new wallet
+        wallet_info = self.solana_trader.create_new_wallet()
         
-                await query.edit_message_text(response)
-            else:
-                await query.edit_message_text("❌ Failed to create a new wallet. Please try again later.")
-                
+        if wallet_info:
+            wallets = self.wallets
+            wlist = wallets['wallets']
+
+            # Add name to wallet info
+            wallet_info['name'] = f"Wallet {len(wlist) + 1}"
             
-        elif callback_data == 'wallet_info':
-            # Direct handling in button_handler instead of calling wallet_info_command
-            if not self.wallet_info:
-                await query.edit_message_text(
-                    "❌ No wallet configured. Use /create_wallet to create a new one."
-                )
-                return
+            # Add to wallets list
+            wlist.append(wallet_info)
             
-            # Get current balance
-            try:
-                balance = await self.solana_trader.get_balance()
-            except Exception as e:
-                logger.error(f"Error getting balance: {str(e)}")
-                balance = 0
+            # Set as active wallet if this is the first wallet
+            if len(wlist) == 1:
+                wallets['active_wallet_index'] = 0
+            
+            # Save wallets
+            await self._save_wallets()
+            
+            # Update trader's wallet info to use the active wallet
+            self.solana_trader.wallet_info = self._get_active_wallet()
             
             # Only show part of the private key for security
-            private_key = self.wallet_info['private_key']
-            safe_private_key = f"{private_key[:5]}...{private_key[-5:]}"
+            safe_private_key = _safe_private_key(wallet_info)
             
             response = (
-                "🔑 Wallet Information\n\n"
-                f"Public Address: {self.wallet_info['public_key']}\n\n"
-                f"Private Key: {safe_private_key}\n\n"
-                f"Balance: {balance} SOL"
+                "✅ New wallet created successfully!\n\n"
+                f"🔑 Public Address: {wallet_info['public_key']}\n\n"
+                f"🔐 Private Key: {safe_private_key}\n\n"
+                f"Total Wallets: {len(wlist)}\n"
+                "Use 'Manage Wallets' to switch between wallets."
             )
-            
+    
             await query.edit_message_text(response)
-        elif callback_data == 'manage_wallets':
-            await self.manage_wallets(update, context)
+        else:
+            await query.edit_message_text("❌ Failed to create a new wallet. Please try again later.")
 
-        elif callback_data.startswith('select_wallet_'):
-            # Extract wallet index from callback data
-            wallet_index = int(callback_data[14:])
-            
-            if wallet_index >= 0 and wallet_index < len(self.wallets['wallets']):
-                # Set as active wallet
-                self.wallets['active_wallet_index'] = wallet_index
-                selected_wallet = self.wallets['wallets'][wallet_index]
-                
-                # Update trader's wallet info
-                self.solana_trader.wallet_info = selected_wallet
-                self.wallet_info = selected_wallet  # For backward compatibility
-                
-                # Save wallets
-                self._save_wallets()
-                
-                wallet_name = selected_wallet.get('name', f"Wallet {wallet_index+1}")
-                await query.edit_message_text(f"✅ Wallet '{wallet_name}' is now active.")
-            else:
-                await query.edit_message_text("❌ Invalid wallet selection.")
-
-        elif callback_data == 'manage_groups':
-            keyboard = [
-                [InlineKeyboardButton("Add Group", callback_data='add_group')],
-                [InlineKeyboardButton("Remove Group", callback_data='remove_group')],
-                [InlineKeyboardButton("List Groups", callback_data='list_groups')],
-                [InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text("📋 Group Management", reply_markup=reply_markup)
-        
-        elif callback_data == 'trading_settings':
-            settings = self.trading_settings
-            text = (
-                "⚙️ *Trading Settings*\n\n"
-                f"Initial Investment: {settings['initial_investment']} SOL\n"
-                f"Take Profit: {settings['take_profit_percentage']}%\n"
-                f"Sell Percentage at Take Profit: {settings['sell_percentage']}%\n"
-                f"Max Slippage: {settings['max_slippage']}%"
-            )
-            
-            keyboard = [
-                [InlineKeyboardButton("Set Investment", callback_data='set_investment_prompt')],
-                [InlineKeyboardButton("Set Take Profit", callback_data='set_take_profit_prompt')],
-                [InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
-        
-        elif callback_data == 'help':
-            help_text = (
-                "🤖 *Solana Trading Bot Help* 🤖\n\n"
-                "*How it works:*\n"
-                "1. Create a wallet or import an existing one\n"
-                "2. Add Telegram groups to monitor\n"
-                "3. Configure your trading settings\n"
-                "4. The bot will automatically trade when new tokens are posted\n\n"
-                
-                "*Commands:*\n"
-                "/start - Show main menu\n"
-                "/help - Show this help\n"
-                "/create_wallet - Create a new wallet\n"
-                "/add_group - Add a group to monitor\n"
-                "/settings - Configure trading parameters"
+    async def _cb_wallet_info(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+
+        wallet_info = self.wallet_info
+        if not wallet_info:
+            await query.edit_message_text(
+                "❌ No wallet configured. Use /create_wallet to create a new one."
             )
-            
-            keyboard = [[InlineKeyboardButton("Back to Main Menu", callback_data='main_menu')]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text(help_text, reply_markup=reply_markup, parse_mode='Markdown')
+            return
         
-        elif callback_data == 'main_menu':
-            # Return to main menu
-            keyboard = [
-                [InlineKeyboardButton("Manage Wallets", callback_data='manage_wallets')],
-                [InlineKeyboardButton("Create Wallet", callback_data='create_wallet')],
-                [InlineKeyboardButton("Wallet Info", callback_data='wallet_info')],
-                [InlineKeyboardButton("Manage Groups", callback_data='manage_groups')],
-                [InlineKeyboardButton("Trading Settings", callback_data='trading_settings')],
-                [InlineKeyboardButton("Help", callback_data='help')]
-            ]
-            
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await query.edit_message_text("Main Menu", reply_markup=reply_markup)
+        # Get current balance
+        try:
+            balance = await self.solana_trader.get_balance()
+        except Exception as e:
+            logger.error("Error getting balance: %s", e)
+            balance = 0
         
-        elif callback_data.startswith('remove_'):
-            # Extract group link from callback data
-            group_to_remove = callback_data[7:]  # Remove 'remove_' prefix
-            
-            if group_to_remove in self.monitored_groups:
-                self.monitored_groups.remove(group_to_remove)
-                self._save_monitored_groups()
-                
-                # Remove the listener for this group
-                await self.telegram_listener.remove_group(group_to_remove)
-                
-                await query.edit_message_text(f"✅ Removed {group_to_remove} from monitored groups.")
-            else:
-                await query.edit_message_text(f"❌ Group not found in the monitored list.")
+        # Only show part of the private key for security
+        safe_private_key = _safe_private_key(wallet_info)
         
-        elif callback_data == 'add_group':
-            await query.edit_message_text(
-                "Please send the Telegram group link using the /add_group command.\n"
-                "Example: /add_group https://t.me/groupname"
-            )
+        response = (
+            "🔑 Wallet Information\n\n"
+            f"Public Address: {wallet_info['public_key']}\n\n"
+            f"Private Key: {safe_private_key}\n\n"
+            f"Balance: {balance} SOL"
+        )
         
-        elif callback_data == 'remove_group':
-            if not self.monitored_groups:
-                await query.edit_message_text("❌ No groups are currently being monitored.")
-                return
+        await query.edit_message_text(response)
+
+    async def _cb_select_wallet(self, update: Update, context: ContextTypes.DEFAULT_TYPE, arg: str) -> None:
+        query = update.callback_query
+
+        # Extract wallet index from callback data
+        wallet_index = int(arg)
+        wallets = self.wallets
+        wlist = wallets['wallets']
+        
+        if 0 <= wallet_index < len(wlist):
+            # Set as active wallet
+            wallets['active_wallet_index'] = wallet_index
+            selected_wallet = wlist[wallet_index]
             
-            keyboard = []
-            for group in self.monitored_groups:
-                keyboard.append([InlineKeyboardButton(group, callback_data=f"remove_{group}")])
+            # Update trader's wallet info
+            self.solana_trader.wallet_info = selected_wallet
+            self.wallet_info = selected_wallet  # For backward compatibility
             
-            keyboard.append([InlineKeyboardButton("Back", callback_data='manage_groups')])
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            # Save wallets
+            self._schedule_save_wallets()
             
-            await query.edit_message_text("Select a group to remove:", reply_markup=reply_markup)
-        
-        elif callback_data == 'list_groups':
-            if not self.monitored_groups:
-                text = "⚠️ No groups are currently being monitored."
-            else:
-                text = "📋 *Monitored Groups:*\n\n"
-                for i, group in enumerate(self.monitored_groups, 1):
-                    text += f"{i}. {group}\n"
+            wallet_name = selected_wallet['name']
+            await query.edit_message_text(f"✅ Wallet '{wallet_name}' is now active.")
+        else:
+            await query.edit_message_text("❌ Invalid wallet selection.")
+
+    async def _cb_manage_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text("📋 Group Management", reply_markup=self._MANAGE_GROUPS_MARKUP)
+
+    async def _cb_trading_settings(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        settings = self.trading_settings
+        text = (
+            "⚙️ *Trading Settings*\n\n"
+            f"Initial Investment: {settings['initial_investment']} SOL\n"
+            f"Take Profit: {settings['take_profit_percentage']}%\n"
+            f"Sell Percentage at Take Profit: {settings['sell_percentage']}%\n"
+            f"Max Slippage: {settings['max_slippage']}%"
+        )
+
+        await update.callback_query.edit_message_text(text, reply_markup=self._TRADING_SETTINGS_MARKUP, parse_mode='Markdown')
+
+    async def _cb_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text(_HELP_TEXT_CB, reply_markup=self._BACK_TO_MAIN_MARKUP, parse_mode='Markdown')
+
+    async def _cb_main_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text("Main Menu", reply_markup=self._MAIN_MENU)
+
+    async def _cb_remove_group_item(self, update: Update, context: ContextTypes.DEFAULT_TYPE, group_to_remove: str) -> None:
+        query = update.callback_query
+
+        if group_to_remove in self.monitored_groups:
+            del self.monitored_groups[group_to_remove]
+            await self._save_monitored_groups()
             
-            keyboard = [[InlineKeyboardButton("Back", callback_data='manage_groups')]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            # Remove the listener for this group
+            await self.telegram_listener.remove_group(group_to_remove)
             
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await query.edit_message_text(f"✅ Removed {group_to_remove} from monitored groups.")
+        else:
+            await query.edit_message_text(f"❌ Group not found in the monitored list.")
+
+    async def _cb_add_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text(
+            "Please send the Telegram group link using the /add_group command.\n"
+            "Example: /add_group https://t.me/groupname"
+        )
+
+    async def _cb_remove_group(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        query = update.callback_query
+
+        if not self.monitored_groups:
+            await query.edit_message_text("❌ No groups are currently being monitored.")
+            return
         
-        elif callback_data == 'set_investment_prompt':
-            await query.edit_message_text(
-                "Please enter the initial investment amount using the /set_investment command.\n"
-                "Example: /set_investment 0.5"
-            )
+        reply_markup = self._build_remove_group_keyboard(with_back=True)
         
-        elif callback_data == 'set_take_profit_prompt':
-            await query.edit_message_text(
-                "Please set the take profit conditions using the /set_take_profit command.\n"
-                "Format: /set_take_profit <profit_percentage> <sell_percentage>\n"
-                "Example: /set_take_profit 30 50 - Sell 50% when profit reaches 30%"
-            )
+        await query.edit_message_text("Select a group to remove:", reply_markup=reply_markup)
+
+    async def _cb_list_groups(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text(
+            self._groups_list_text(),
+            reply_markup=self._BACK_TO_GROUPS_MARKUP,
+            parse_mode='MarkdownV2'
+        )
+
+    async def _cb_set_investment_prompt(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text(
+            "Please enter the initial investment amount using the /set_investment command.\n"
+            "Example: /set_investment 0.5"
+        )
+
+    async def _cb_set_take_profit_prompt(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        await update.callback_query.edit_message_text(
+            "Please set the take profit conditions using the /set_take_profit command.\n"
+            "Format: /set_take_profit <profit_percentage> <sell_percentage>\n"
+            "Example: /set_take_profit 30 50 - Sell 50% when profit reaches 30%"
+        )
 
     async def text_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle text messages that aren't commands."""
@@ -761,7 +1280,16 @@ class TradingBot:
     async def error_handler(self, update, context):
         """Handle errors."""
         # Log the error
-        logger.error(f"Update {update} caused error {context.error}")
+        logger.error("Update %s caused error %s", update, context.error)
+
+        # Tell the user at most once per ERROR_REPLY_INTERVAL per chat, so a
+        # failing backend doesn't turn into a flood of replies
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if chat is not None:
+            now = asyncio.get_running_loop().time()
+            if now - self._last_err_reply.get(chat.id, float('-inf')) < ERROR_REPLY_INTERVAL:
+                return
+            self._last_err_reply[chat.id] = now
     
         # Check if the update has a message or a callback query
         if update and update.message:
@@ -778,156 +1306,307 @@ class TradingBot:
             # If there's no clear way to respond, log it
             logger.warning("Error occurred, but no valid update object to reply to.")
 
+    async def _dispatch_new_ca(self, ca_address, group_name):
+        """Hand a detected CA off to process_new_ca without blocking the listener."""
+        task = asyncio.create_task(self._process_new_ca_ordered(ca_address, group_name))
+        self._ca_tasks.add(task)
+        task.add_done_callback(self._ca_tasks.discard)
+
+    async def _process_new_ca_ordered(self, ca_address, group_name):
+        async with self._group_locks[group_name]:
+            try:
+                await self.process_new_ca(ca_address, group_name)
+            except Exception as e:
+                logger.error("Error processing CA %s: %s", ca_address, e)
+
     # This part already exists and should work if user_chat_id is properly set
     async def process_new_ca(self, ca_address, group_name):
         """Process a new crypto address found in a monitored group."""
-        logger.info(f"New CA detected: {ca_address} from {group_name}")
+        logger.info("New CA detected: %s from %s", ca_address, group_name)
         
         # Always notify about the new CA detection first
-        try:
-            await self.notify_user(
-                f"🔍 *New Token Detected*\n\n"
-                f"Token Address: `{ca_address}`\n"
-                f"Found in: {group_name}"
-            )
-        except Exception as e:
-            logger.error(f"Error sending notification: {str(e)}")
+        if self.can_notify:
+            try:
+                await self.notify_user(self.NEW_TOKEN_TMPL.format(
+                    token=ca_address, group=escape_markdown(group_name)
+                ))
+            except Exception as e:
+                logger.error("Error sending notification: %s", e)
 
         # Then proceed with trading logic if applicable
-        if ca_address in self.trading_settings['traded_tokens']:
-            await self.notify_user(
-                f"ℹ️ *Trading Skipped*\n\n"
-                f"Token: `{ca_address}`\n"
-                f"Reason: Already traded previously"
-            )
+        self._evict_expired_traded_tokens()
+        if ca_address in self._traded_tokens or ca_address in self._buys_in_progress:
+            if self.can_notify:
+                await self.notify_user(self.TRADE_SKIPPED_TMPL.format(token=ca_address))
             return
         
         # Execute trade
-        trade_result = await self.solana_trader.buy_token(
-            ca_address, 
-            self.trading_settings['initial_investment'],
-            self.trading_settings['max_slippage']
-        )
+        self._buys_in_progress.add(ca_address)
+        try:
+            trade_result = await self.solana_trader.buy_token(
+                ca_address, 
+                self.trading_settings['initial_investment'],
+                self.trading_settings['max_slippage']
+            )
+            if trade_result['success']:
+                bought_at = self._traded_tokens[ca_address] = time.time()
+        finally:
+            self._buys_in_progress.discard(ca_address)
         
         if trade_result['success']:
-            # Add to traded tokens list
-            self.trading_settings['traded_tokens'].append(ca_address)
-            self._save_trading_settings()
+            # Add to traded tokens log
+            await self._append_traded_tokens({ca_address: bought_at})
             
             # Start monitoring for take profit
-            asyncio.create_task(self.monitor_token_price(
-                ca_address,
-                trade_result['price'],
-                trade_result['amount']
-            ))
+            self._start_monitor(ca_address, trade_result['price'], trade_result['amount'])
             
             # Notify user about successful trade
-            await self.notify_user(
-                f"🚀 *New Token Trade*\n\n"
-                f"Token: `{ca_address}`\n"
-                f"Group: {group_name}\n"
-                f"Amount: {self.trading_settings['initial_investment']} SOL\n"
-                f"Tokens purchased: {trade_result['amount']}\n"
-                f"Entry price: {trade_result['price']} SOL per token\n\n"
-                f"Now monitoring for take profit at {self.trading_settings['take_profit_percentage']}%"
-            )
-        else:
+            if self.can_notify:
+                await self.notify_user(self.NEW_TRADE_TMPL.format(
+                    token=ca_address,
+                    group=escape_markdown(group_name),
+                    investment=self.trading_settings['initial_investment'],
+                    amount=trade_result['amount'],
+                    price=trade_result['price'],
+                    take_profit=self.trading_settings['take_profit_percentage'],
+                ))
+        elif self.can_notify:
             # Notify about failed trade
-            await self.notify_user(
-                f"⚠️ *Trade Failed*\n\n"
-                f"Token: `{ca_address}`\n"
-                f"Group: {group_name}\n"
-                f"Error: {trade_result['error']}"
-            )
+            await self.notify_user(self.TRADE_FAILED_TMPL.format(
+                token=ca_address,
+                group=escape_markdown(group_name),
+                error=escape_markdown(str(trade_result['error'])),
+            ))
+
+    def _start_monitor(self, token_address, entry_price, token_amount):
+        """Start monitor_token_price in a tracked task.
+
+        A token that is already monitored has its old monitor replaced.
+        """
+        previous = self._monitors.pop(token_address, None)
+        if previous is not None:
+            logger.info("Replacing existing monitor for %s", token_address)
+            previous.cancel()
+
+        task = asyncio.create_task(self.monitor_token_price(token_address, entry_price, token_amount))
+        self._monitors[token_address] = task
+        task.add_done_callback(lambda t: self._monitor_done(token_address, t))
+
+    def _monitor_done(self, token_address, task):
+        if self._monitors.get(token_address) is task:
+            del self._monitors[token_address]
 
     async def monitor_token_price(self, token_address, entry_price, token_amount):
         """Monitor token price and execute take profit if conditions are met."""
-        take_profit_price = entry_price * (1 + self.trading_settings['take_profit_percentage'] / 100)
-        sell_amount = token_amount * (self.trading_settings['sell_percentage'] / 100)
+        # Settings are fixed for the lifetime of this position
+        sell_percentage = self.trading_settings['sell_percentage']
+        max_slippage = self.trading_settings['max_slippage']
+        tp_mult = self._tp_mult
+        take_profit_price = entry_price * tp_mult
+        # Fixed share of the original position sold at each take profit
+        sell_amount = token_amount * self._sell_frac
         
-        logger.info(f"Starting price monitoring for {token_address}")
-        logger.info(f"Entry price: {entry_price}, Take profit price: {take_profit_price}")
+        logger.info("Starting price monitoring for %s", token_address)
+        logger.info("Entry price: %s, Take profit price: %s", entry_price, take_profit_price)
         
-        # Keep monitoring until take profit is reached or max monitoring time passed
-        max_monitoring_time = 60 * 60 * 24  # 24 hours
-        monitoring_interval = 60  # Check every 60 seconds
-        elapsed_time = 0
+        # Keep monitoring until take profit is reached or max monitoring time passed.
+        # Timing is driven by the loop clock so request latency doesn't stretch the window.
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + MAX_MONITORING_TIME
         
-        while elapsed_time < max_monitoring_time:
-            # Get current price
-            current_price = await self.solana_trader.get_token_price(token_address)
+        while (check_started := loop.time()) < deadline:
+            # Get current price, and sell if the target is reached, with at most
+            # MAX_CONCURRENT_MONITOR_CHECKS monitors doing so at once
+            async with self._monitor_sem:
+                current_price = await self.solana_trader.get_token_price(token_address)
+                
+                if current_price >= take_profit_price:
+                    # Execute take profit
+                    sell_result = await self.solana_trader.sell_token(
+                        token_address,
+                        sell_amount,
+                        max_slippage
+                    )
             
             if current_price >= take_profit_price:
-                # Execute take profit
-                sell_result = await self.solana_trader.sell_token(
-                    token_address,
-                    sell_amount,
-                    self.trading_settings['max_slippage']
-                )
-                
                 if sell_result['success']:
-                    # Calculate profit
-                    profit = (sell_result['price'] - entry_price) * sell_amount
-                    profit_percentage = ((sell_result['price'] / entry_price) - 1) * 100
-                    
-                    # Notify user
-                    await self.notify_user(
-                        f"💰 *Take Profit Executed*\n\n"
-                        f"Token: `{token_address}`\n"
-                        f"Sold: {sell_amount} tokens ({self.trading_settings['sell_percentage']}% of position)\n"
-                        f"Entry price: {entry_price} SOL\n"
-                        f"Exit price: {sell_result['price']} SOL\n"
-                        f"Profit: {profit:.4f} SOL ({profit_percentage:.2f}%)"
-                    )
+                    exit_price = sell_result['price']
+
+                    if self.can_notify:
+                        # Calculate profit
+                        profit = (exit_price - entry_price) * sell_amount
+                        profit_percentage = ((exit_price / entry_price) - 1) * 100
+                        
+                        # Notify user
+                        await self.notify_user(self.TAKE_PROFIT_TMPL.format(
+                            token=token_address,
+                            sold=sell_amount,
+                            sell_percentage=sell_percentage,
+                            entry_price=entry_price,
+                            exit_price=exit_price,
+                            profit=profit,
+                            profit_percentage=profit_percentage,
+                        ))
                     
                     # If we sold 100%, stop monitoring
-                    if self.trading_settings['sell_percentage'] >= 100:
+                    if sell_percentage >= 100:
                         return
                     
                     # Update monitoring parameters for the remaining position
                     token_amount -= sell_amount
-                    take_profit_price = sell_result['price'] * 1.1  # New take profit at +10% from current
-                else:
+                    take_profit_price = exit_price * 1.1  # New take profit at +10% from current
+                elif self.can_notify:
                     # Notify about failed sell
-                    await self.notify_user(
-                        f"⚠️ *Take Profit Failed*\n\n"
-                        f"Token: `{token_address}`\n"
-                        f"Error: {sell_result['error']}"
-                    )
+                    await self.notify_user(self.TAKE_PROFIT_FAILED_TMPL.format(
+                        token=token_address,
+                        error=escape_markdown(str(sell_result['error'])),
+                    ))
             
-            # Wait before next check
-            await asyncio.sleep(monitoring_interval)
-            elapsed_time += monitoring_interval
+            # Wait before next check, longer the further we are from the target
+            monitoring_interval = _price_poll_interval(current_price, take_profit_price, tp_mult - 1)
+            next_check = min(check_started + monitoring_interval, deadline)
+            await asyncio.sleep(max(0, next_check - loop.time()))
+
+    @property
+    def can_notify(self):
+        """Whether notify_user has a chat to send to; check before building a message."""
+        return self.user_chat_id is not None
 
     async def notify_user(self, message):
-        """Notify the user about important events."""
+        """Notify the user about important events.
+
+        Messages are queued and sent by _notify_worker, so callers never wait
+        on the Telegram API.
+        """
+        # Nothing to send to until the user has run /start
+        if self.user_chat_id is not None:
+            self._notify_q.put_nowait((self.user_chat_id, message))
+
+    async def _notify_worker(self):
+        """Send queued notifications, merging bursts; _send_message paces them per chat."""
+        while True:
+            chat_id, message = await self._notify_q.get()
+
+            # Give the rest of a burst a moment to arrive, then send it as one message
+            await asyncio.sleep(NOTIFY_COALESCE_DELAY)
+            messages = [message]
+            other_chats = []
+            while len(messages) < NOTIFY_MAX_BATCH and not self._notify_q.empty():
+                item = self._notify_q.get_nowait()
+                if item[0] == chat_id:
+                    messages.append(item[1])
+                else:
+                    other_chats.append(item)
+            for item in other_chats:
+                self._notify_q.put_nowait(item)
+
+            try:
+                await self._send_notification(chat_id, messages)
+            finally:
+                # One task_done per get, so _drain_notifications can join the queue
+                for _ in range(len(messages) + len(other_chats)):
+                    self._notify_q.task_done()
+
+    async def _drain_notifications(self):
+        """Give queued notifications up to NOTIFY_DRAIN_TIMEOUT seconds to go out."""
+        try:
+            await asyncio.wait_for(self._notify_q.join(), NOTIFY_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %s unsent notifications on shutdown", self._notify_q.qsize())
+
+    async def _send_notification(self, chat_id, messages):
+        """Send a batch of messages as one.
+
+        If Telegram rejects the batch (typically Markdown it can't parse), the
+        messages are resent one by one so only the bad one is affected, and a
+        single rejected message is resent as plain text.
+        """
         try:
-            # Get the most recent chat ID from context or configuration
-            # You should store this when the user first interacts with the bot (/start command)
-            if hasattr(self, 'user_chat_id'):
+            await self._send_message(chat_id, NOTIFY_SEPARATOR.join(messages))
+            return
+        except BadRequest as e:
+            if len(messages) > 1:
+                logger.warning("Batched notification rejected (%s), sending one by one", e)
+            else:
+                logger.warning("Notification rejected (%s), resending without formatting", e)
+
+        if len(messages) > 1:
+            for message in messages:
+                await self._send_notification(chat_id, [message])
+            return
+
+        try:
+            await self._send_message(chat_id, messages[0], parse_mode=None)
+        except BadRequest as e:
+            logger.error("Error sending notification: %s", e)
+
+    async def _send_message(self, chat_id, text, parse_mode='Markdown', max_attempts=3):
+        """Send one message, waiting out Telegram flood limits.
+
+        Sends to a chat are spaced at least NOTIFY_MIN_INTERVAL seconds apart,
+        including the one-by-one resends of a rejected batch. BadRequest is
+        raised for the caller to handle; other errors are logged.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(max_attempts):
+            wait = self._notify_last_sent.get(chat_id, 0) + NOTIFY_MIN_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._notify_last_sent[chat_id] = loop.time()
+            try:
                 await self.telegram_bot.bot.send_message(
-                    chat_id=self.user_chat_id,
-                    text=message,
-                    parse_mode='Markdown'
+                    chat_id=chat_id,
+                    text=text,
+                    parse_mode=parse_mode
                 )
-        except Exception as e:
-            logger.error(f"Error sending notification: {str(e)}")
+                return
+            except RetryAfter as e:
+                logger.warning("Flood limit hit, retrying notification in %ss", e.retry_after)
+                await asyncio.sleep(e.retry_after)
+            except BadRequest:
+                raise
+            except Exception as e:
+                logger.error("Error sending notification: %s", e)
+                return
+        logger.error("Giving up on notification after repeated flood limits")
 
     async def run(self):
         """Run the bot."""
         # Start the Telegram listener
         await self.telegram_listener.start(self.monitored_groups)
 
-        # Start polling and block until stopped
-        await self.telegram_bot.run_polling()
+        # Drive PTB on the already running loop; run_polling() would try to
+        # start and close a loop of its own.
+        async with self.telegram_bot:
+            await self.telegram_bot.start()
+            await self.telegram_bot.updater.start_polling()
+            logger.info("Bot started!")
 
-        logger.info("Bot started!")
+            self._notify_task = asyncio.create_task(self._notify_worker())
+
+            # Run until the listener disconnects or we are cancelled (e.g. Ctrl+C),
+            # then shut down cleanly
+            try:
+                await self.telegram_listener.run_until_disconnected()
+            finally:
+                await self._drain_notifications()
+                self._notify_task.cancel()
+                await self._flush_pending_saves()
+                await self.solana_trader.close()
+                await self.telegram_bot.updater.stop()
+                await self.telegram_bot.stop()
+                await self.telegram_listener.stop()
 
 
 async def main():
     """Main function."""
-    bot = TradingBot()
-    await bot.run()
+    log_listener = _start_log_listener()
+    try:
+        bot = TradingBot()
+        await bot.async_setup()
+        await bot.run()
+    finally:
+        log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 import logging
 import asyncio
-import json
+import base64
+import orjson
 import time
 import base58
+import random
 import secrets
 from solana.rpc.async_api import AsyncClient
 from solana.keypair import Keypair
@@ -11,87 +13,285 @@ from solana.transaction import Transaction
 from solana.system_program import transfer, TransferParams
 import httpx
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request headers for bodies we serialize ourselves with orjson
+_JSON_HEADERS = {'content-type': 'application/json'}
+
+# Most calls sent in one JSON-RPC batch; public RPC nodes reject larger batches
+RPC_BATCH_LIMIT = 100
+
+# Seconds a fetched token price is reused, so monitors of the same token and
+# re-posted CAs share one Jupiter quote
+PRICE_CACHE_TTL = 3.0
+# Once the price cache holds more than PRICE_CACHE_MAX tokens, entries older
+# than PRICE_CACHE_MAX_AGE seconds are swept out
+PRICE_CACHE_MAX = 1024
+PRICE_CACHE_MAX_AGE = 10.0
+
+# Seconds a fetched wallet balance is reused before asking the RPC again
+BALANCE_CACHE_TTL = 2.0
+
+# Generates simulated transaction IDs; seeded once from the OS instead of
+# reading /dev/urandom for every simulated trade
+_SIM_RNG = random.Random(secrets.randbits(128))
+
+# Wrapped SOL mint, the other side of every Jupiter quote
+WSOL_MINT = 'So11111111111111111111111111111111111111112'
+
+# HTTP/2 client with a keep-alive pool shared by every trader, so Jupiter
+# requests reuse TLS connections instead of opening new ones. Created for the
+# first trader that needs it and closed when the last of them is closed.
+_shared_http = None
+_shared_http_users = 0
+
+
+def _acquire_shared_http():
+    global _shared_http, _shared_http_users
+    if _shared_http is None:
+        _shared_http = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=100, keepalive_expiry=30.0),
+        )
+    _shared_http_users += 1
+    return _shared_http
+
+
+async def _release_shared_http():
+    global _shared_http, _shared_http_users
+    _shared_http_users -= 1
+    if _shared_http_users == 0:
+        client, _shared_http = _shared_http, None
+        await client.aclose()
+
+
+class _SingleFlightCache:
+    """Values by key, reused for ttl seconds; concurrent misses share one fetch.
+
+    Only successful fetches are cached. Once more than max_size keys are held,
+    entries older than max_age seconds are swept out.
+    """
+
+    def __init__(self, ttl, max_size=1024, max_age=None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_age = ttl if max_age is None else max_age
+        # key -> (monotonic fetch time, value), and key -> future of a running fetch
+        self._values = {}
+        self._inflight = {}
+
+    async def get(self, key, fetch):
+        """Return a recent value for key, or await a shared call of fetch()."""
+        hit = self._values.get(key)
+        if hit and time.monotonic() - hit[0] < self.ttl:
+            return hit[1]
+
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(key, fetch))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(future)
+
+    async def _fetch(self, key, fetch):
+        value = await fetch()
+        now = time.monotonic()
+        values = self._values
+        values[key] = (now, value)
+        if len(values) > self.max_size:
+            cutoff = now - self.max_age
+            for stale in [k for k, (fetched, _) in values.items() if fetched < cutoff]:
+                del values[stale]
+        return value
+
+
 class SolanaTrader:
-    def __init__(self, wallet_info=None, trading_settings=None):
+    def __init__(self, wallet_info=None, trading_settings=None, http_client=None):
         """
         Initialize the Solana trader.
         
         Args:
             wallet_info: Dictionary with wallet information (public_key, private_key)
             trading_settings: Dictionary with trading settings
+            http_client: httpx.AsyncClient to use for Jupiter API calls;
+                defaults to the module's shared client
         """
-        self.wallet_info = wallet_info
         self.trading_settings = trading_settings or {}
         
         # Initialize RPC client (uses Solana mainnet by default)
-        self.client = AsyncClient("https://api.mainnet-beta.solana.com")
+        self.rpc_url = "https://api.mainnet-beta.solana.com"
+        self.client = AsyncClient(self.rpc_url)
         
         # Jupiter API URL
         self.jupiter_api_url = "https://quote-api.jup.ag/v6"
+        self._quote_url = self.jupiter_api_url + "/quote"
+        self._swap_url = self.jupiter_api_url + "/swap-instructions"
+
+        # Fixed Jupiter quote parameters; requests copy these and fill in the rest
+        self._price_params_tpl = {
+            'outputMint': WSOL_MINT,
+            'amount': '1000000',  # 1 token with 6 decimals
+            'slippageBps': 50  # 0.5% slippage
+        }
+        self._buy_params_tpl = {
+            'inputMint': WSOL_MINT,
+            'platformFeeBps': 0,  # No platform fee
+            'onlyDirectRoutes': False
+        }
+        self._sell_params_tpl = {
+            'outputMint': WSOL_MINT,
+            'platformFeeBps': 0  # No platform fee
+        }
         
-        # HTTP client for Jupiter API
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        # HTTP client for Jupiter API; a caller-supplied client is left for the caller to close
+        self._uses_shared_http = http_client is None
+        self.http_client = http_client or _acquire_shared_http()
+
+        # Token prices by mint and balances by wallet address
+        self._price_cache = _SingleFlightCache(PRICE_CACHE_TTL, PRICE_CACHE_MAX, PRICE_CACHE_MAX_AGE)
+        self._balance_cache = _SingleFlightCache(BALANCE_CACHE_TTL)
         
         # Load keypair if wallet info is provided
+        self.wallet_info = wallet_info
+
+    async def close(self):
+        """Close the RPC client, and the shared HTTP client if no other trader uses it."""
+        await self.client.close()
+        if self._uses_shared_http:
+            self._uses_shared_http = False
+            await _release_shared_http()
+
+    @property
+    def wallet_info(self):
+        return self._wallet_info
+
+    @wallet_info.setter
+    def wallet_info(self, wallet_info):
+        """Switch wallets, decoding the keypair and public key once for all later calls."""
+        self._wallet_info = wallet_info
         self.keypair = None
+        self._pubkey = None
+        self._pubkey_str = wallet_info.get('public_key') if wallet_info else None
         if wallet_info and 'private_key' in wallet_info:
             try:
                 self.keypair = Keypair.from_secret_key(
                     base58.b58decode(wallet_info['private_key'])
                 )
+                self._pubkey = self.keypair.public_key
+                self._pubkey_str = str(self._pubkey)
             except Exception as e:
-                logger.error(f"Error loading keypair: {str(e)}")
+                logger.error("Error loading keypair: %s", e)
 
     def create_new_wallet(self):
         """Create a new Solana wallet."""
         try:
             # Generate a new keypair
-            self.keypair = Keypair()
+            keypair = Keypair()
             
             # Get private key as bytes and encode to base58
-            private_key = base58.b58encode(self.keypair.secret_key).decode('utf-8')
+            private_key = base58.b58encode(keypair.secret_key).decode('utf-8')
             
             # Get public key as string
-            public_key = str(self.keypair.public_key)
+            public_key = str(keypair.public_key)
             
-            # Update wallet info
+            # Update wallet info; this also loads the keypair for trading
             self.wallet_info = {
                 'public_key': public_key,
                 'private_key': private_key
             }
             
-            logger.info(f"Created new wallet with address: {public_key}")
+            logger.info("Created new wallet with address: %s", public_key)
             
             return self.wallet_info
             
         except Exception as e:
-            logger.error(f"Error creating wallet: {str(e)}")
+            logger.error("Error creating wallet: %s", e)
             return None
 
+    async def _rpc_batch(self, calls):
+        """
+        Send several JSON-RPC calls to the Solana node in one HTTP request.
+        
+        Args:
+            calls: List of (method, params) tuples
+            
+        Returns:
+            list: The result of each call, in the order given
+        """
+        payload = [
+            {'jsonrpc': '2.0', 'id': i, 'method': method, 'params': params}
+            for i, (method, params) in enumerate(calls)
+        ]
+        response = await self.http_client.post(
+            self.rpc_url, content=orjson.dumps(payload), headers=_JSON_HEADERS
+        )
+        response.raise_for_status()
+        
+        body = orjson.loads(response.content)
+        if not isinstance(body, list):
+            # The node rejected the whole batch with a single error object
+            error = body.get('error', body) if isinstance(body, dict) else body
+            raise RuntimeError(f"RPC error: {error}")
+        
+        # Responses may come back in any order; match them up by id
+        results = {}
+        for item in body:
+            if 'error' in item:
+                raise RuntimeError(f"RPC error: {item['error']}")
+            results[item['id']] = item['result']
+        missing = [method for i, (method, _) in enumerate(calls) if i not in results]
+        if missing:
+            raise RuntimeError(f"RPC error: no result for {', '.join(missing)}")
+        return [results[i] for i in range(len(calls))]
+
+    async def get_balances(self, pubkeys):
+        """
+        Get the balances of several wallets in SOL.
+        
+        All balances are fetched in one JSON-RPC batch, or in concurrent
+        batches of RPC_BATCH_LIMIT when there are more wallets than that.
+        
+        Args:
+            pubkeys: Wallet addresses
+            
+        Returns:
+            list: Balance of each wallet in SOL, in the order given
+        """
+        calls = [('getBalance', [str(pubkey)]) for pubkey in pubkeys]
+        if not calls:
+            return []
+        
+        batches = await asyncio.gather(*(
+            self._rpc_batch(calls[i:i + RPC_BATCH_LIMIT])
+            for i in range(0, len(calls), RPC_BATCH_LIMIT)
+        ))
+        # Convert lamports to SOL (1 SOL = 10^9 lamports)
+        return [result['value'] / 10**9 for batch in batches for result in batch]
+
     async def get_balance(self):
-        """Get the wallet balance in SOL."""
+        """Get the wallet balance in SOL.
+
+        Balances are reused for BALANCE_CACHE_TTL seconds, and concurrent
+        lookups of the same wallet share a single request.
+        """
         if not self.wallet_info or 'public_key' not in self.wallet_info:
             logger.error("No wallet configured")
             return 0
         
+        pubkey = self._pubkey_str
         try:
-            response = await self.client.get_balance(
-                PublicKey(self.wallet_info['public_key'])
-            )
-            
-            # Convert lamports to SOL (1 SOL = 10^9 lamports)
-            balance_sol = response['result']['value'] / 10**9
-            
-            return balance_sol
+            return await self._balance_cache.get(pubkey, lambda: self._fetch_balance(pubkey))
             
         except Exception as e:
-            logger.error(f"Error getting balance: {str(e)}")
+            logger.error("Error getting balance: %s", e)
             return 0
 
+    async def _fetch_balance(self, pubkey):
+        balances = await self.get_balances([pubkey])
+        return balances[0]
+
     async def withdraw(self, amount, destination):
         """
         Withdraw SOL to another wallet.
@@ -106,6 +306,13 @@ class SolanaTrader:
         if not self.keypair:
             return {'success': False, 'error': 'No wallet configured'}
         
+        # Fetch the balance and a recent blockhash in one round trip, while the
+        # transaction is being built
+        rpc_task = asyncio.create_task(self._rpc_batch([
+            ('getBalance', [self._pubkey_str]),
+            ('getLatestBlockhash', []),
+        ]))
+        
         try:
             # Convert SOL to lamports
             lamports = int(amount * 10**9)
@@ -113,36 +320,36 @@ class SolanaTrader:
             # Create transfer instruction
             transfer_ix = transfer(
                 TransferParams(
-                    from_pubkey=self.keypair.public_key,
+                    from_pubkey=self._pubkey,
                     to_pubkey=PublicKey(destination),
                     lamports=lamports
                 )
             )
-            
-            # Create and sign transaction
             transaction = Transaction().add(transfer_ix)
-            transaction.recent_blockhash = (await self.client.get_recent_blockhash())['result']['value']['blockhash']
-            transaction.sign(self.keypair)
             
-            # Send transaction
-            result = await self.client.send_raw_transaction(transaction.serialize())
+            balance, blockhash = await rpc_task
+            if balance['value'] < lamports:
+                return {'success': False, 'error': 'Insufficient balance'}
             
-            if 'result' in result:
-                signature = result['result']
-                logger.info(f"Withdrawal successful, signature: {signature}")
-                return {
-                    'success': True,
-                    'signature': signature
-                }
-            else:
-                logger.error(f"Withdrawal failed: {result}")
-                return {
-                    'success': False,
-                    'error': str(result.get('error', 'Unknown error'))
-                }
+            # Sign transaction
+            transaction.recent_blockhash = blockhash['value']['blockhash']
+            transaction.sign(self.keypair)
+            
+            # Send transaction over the same JSON-RPC path as the reads, so
+            # the result is plain JSON whatever solana-py version is installed
+            (signature,) = await self._rpc_batch([
+                ('sendTransaction', [base64.b64encode(transaction.serialize()).decode('ascii'),
+                                     {'encoding': 'base64'}]),
+            ])
+            logger.info("Withdrawal successful, signature: %s", signature)
+            return {
+                'success': True,
+                'signature': signature
+            }
                 
         except Exception as e:
-            logger.error(f"Error during withdrawal: {str(e)}")
+            rpc_task.cancel()
+            logger.error("Error during withdrawal: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -152,6 +359,9 @@ class SolanaTrader:
         """
         Get the current price of a token in SOL.
         
+        Prices are reused for PRICE_CACHE_TTL seconds, and concurrent lookups
+        of the same token share a single request.
+        
         Args:
             token_address: Token mint address
             
@@ -159,33 +369,29 @@ class SolanaTrader:
             float: Token price in SOL
         """
         try:
-            # Use Jupiter API to get a quote for 1 token to SOL
-            params = {
-                'inputMint': token_address,
-                'outputMint': 'So11111111111111111111111111111111111111112',  # Wrapped SOL
-                'amount': '1000000',  # 1 token with 6 decimals
-                'slippageBps': 50  # 0.5% slippage
-            }
-            
-            response = await self.http_client.get(
-                f"{self.jupiter_api_url}/quote",
-                params=params
+            return await self._price_cache.get(
+                token_address, lambda: self._fetch_token_price(token_address)
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Extract the price in SOL
-                price_in_lamports = int(data['outAmount'])
-                price_in_sol = price_in_lamports / 10**9
-                return price_in_sol
-            else:
-                logger.error(f"Error getting token price: {response.text}")
-                return 0
                 
         except Exception as e:
-            logger.error(f"Error getting token price: {str(e)}")
+            logger.error("Error getting token price: %s", e)
             return 0
 
+    async def _fetch_token_price(self, token_address):
+        """Ask Jupiter for a token price; raises if the quote fails, so it isn't cached."""
+        # Use Jupiter API to get a quote for 1 token to SOL
+        params = self._price_params_tpl.copy()
+        params['inputMint'] = token_address
+        
+        response = await self.http_client.get(self._quote_url, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(response.text)
+        
+        data = orjson.loads(response.content)
+        # Extract the price in SOL
+        price_in_lamports = int(data['outAmount'])
+        return price_in_lamports / 10**9
+
     async def buy_token(self, token_address, sol_amount, slippage=1):
         """
         Buy a token using the Jupiter API.
@@ -206,19 +412,12 @@ class SolanaTrader:
             lamports = int(sol_amount * 10**9)
             
             # Get quote from Jupiter
-            params = {
-                'inputMint': 'So11111111111111111111111111111111111111112',  # Wrapped SOL
-                'outputMint': token_address,
-                'amount': str(lamports),
-                'slippageBps': int(slippage * 100),  # Convert percentage to basis points
-                'platformFeeBps': 0,  # No platform fee
-                'onlyDirectRoutes': False
-            }
+            params = self._buy_params_tpl.copy()
+            params['outputMint'] = token_address
+            params['amount'] = str(lamports)
+            params['slippageBps'] = int(slippage * 100)  # Convert percentage to basis points
             
-            quote_response = await self.http_client.get(
-                f"{self.jupiter_api_url}/quote",
-                params=params
-            )
+            quote_response = await self.http_client.get(self._quote_url, params=params)
             
             if quote_response.status_code != 200:
                 return {
@@ -226,18 +425,17 @@ class SolanaTrader:
                     'error': f"Quote error: {quote_response.text}"
                 }
             
-            quote_data = quote_response.json()
+            quote_data = orjson.loads(quote_response.content)
             
             # Get the swap instructions from Jupiter
             swap_params = {
                 'quoteResponse': quote_data,
-                'userPublicKey': str(self.keypair.public_key),
+                'userPublicKey': self._pubkey_str,
                 'wrapUnwrapSOL': True
             }
             
             swap_response = await self.http_client.post(
-                f"{self.jupiter_api_url}/swap-instructions",
-                json=swap_params
+                self._swap_url, content=orjson.dumps(swap_params), headers=_JSON_HEADERS
             )
             
             if swap_response.status_code != 200:
@@ -246,7 +444,7 @@ class SolanaTrader:
                     'error': f"Swap instructions error: {swap_response.text}"
                 }
             
-            swap_data = swap_response.json()
+            swap_data = orjson.loads(swap_response.content)
             
             # Now we'd execute the transaction using the swap instructions
             # This is a simplified version; in a real implementation, you'd need to:
@@ -256,7 +454,7 @@ class SolanaTrader:
             # 4. Wait for confirmation
             
             # For now, we'll simulate a successful trade
-            logger.info(f"Simulating purchase of token {token_address} with {sol_amount} SOL")
+            logger.info("Simulating purchase of token %s with %s SOL", token_address, sol_amount)
             
             # Calculate token amount received (from quote)
             token_amount = int(quote_data['outAmount']) / 10**6  # Assuming 6 decimals
@@ -268,11 +466,11 @@ class SolanaTrader:
                 'success': True,
                 'amount': token_amount,
                 'price': price_per_token,
-                'transaction_id': f"sim_{secrets.token_hex(16)}"
+                'transaction_id': f"sim_{_SIM_RNG.getrandbits(128):032x}"
             }
             
         except Exception as e:
-            logger.error(f"Error buying token: {str(e)}")
+            logger.error("Error buying token: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -298,18 +496,12 @@ class SolanaTrader:
             token_units = int(token_amount * 10**6)
             
             # Get quote from Jupiter
-            params = {
-                'inputMint': token_address,
-                'outputMint': 'So11111111111111111111111111111111111111112',  # Wrapped SOL
-                'amount': str(token_units),
-                'slippageBps': int(slippage * 100),  # Convert percentage to basis points
-                'platformFeeBps': 0  # No platform fee
-            }
+            params = self._sell_params_tpl.copy()
+            params['inputMint'] = token_address
+            params['amount'] = str(token_units)
+            params['slippageBps'] = int(slippage * 100)  # Convert percentage to basis points
             
-            quote_response = await self.http_client.get(
-                f"{self.jupiter_api_url}/quote",
-                params=params
-            )
+            quote_response = await self.http_client.get(self._quote_url, params=params)
             
             if quote_response.status_code != 200:
                 return {
@@ -317,18 +509,17 @@ class SolanaTrader:
                     'error': f"Quote error: {quote_response.text}"
                 }
             
-            quote_data = quote_response.json()
+            quote_data = orjson.loads(quote_response.content)
             
             # Get the swap instructions from Jupiter
             swap_params = {
                 'quoteResponse': quote_data,
-                'userPublicKey': str(self.keypair.public_key),
+                'userPublicKey': self._pubkey_str,
                 'wrapUnwrapSOL': True
             }
             
             swap_response = await self.http_client.post(
-                f"{self.jupiter_api_url}/swap-instructions",
-                json=swap_params
+                self._swap_url, content=orjson.dumps(swap_params), headers=_JSON_HEADERS
             )
             
             if swap_response.status_code != 200:
@@ -337,7 +528,7 @@ class SolanaTrader:
                     'error': f"Swap instructions error: {swap_response.text}"
                 }
             
-            swap_data = swap_response.json()
+            swap_data = orjson.loads(swap_response.content)
             
             # Now we'd execute the transaction using the swap instructions
             # This is a simplified version; in a real implementation, you'd need to:
@@ -347,7 +538,7 @@ class SolanaTrader:
             # 4. Wait for confirmation
             
             # For now, we'll simulate a successful trade
-            logger.info(f"Simulating sale of {token_amount} tokens of {token_address}")
+            logger.info("Simulating sale of %s tokens of %s", token_amount, token_address)
             
             # Calculate SOL received (from quote)
             sol_received = int(quote_data['outAmount']) / 10**9
@@ -360,11 +551,11 @@ class SolanaTrader:
                 'amount_sold': token_amount,
                 'sol_received': sol_received,
                 'price': price_per_token,
-                'transaction_id': f"sim_{secrets.token_hex(16)}"
+                'transaction_id': f"sim_{_SIM_RNG.getrandbits(128):032x}"
             }
             
         except Exception as e:
-            logger.error(f"Error selling token: {str(e)}")
+            logger.error("Error selling token: %s", e)
             return {
                 'success': False,
                 'error': str(e)
@@ -1,13 +1,69 @@
 import logging
 import re
+import time
 import asyncio
-from telethon import TelegramClient, events
-from telethon.tl.types import Channel
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import base58
+from telethon import TelegramClient, events, utils
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Group links look like https://t.me/<username>
+_TME = "https://t.me/"
+
+# Solana addresses (base58 encoded, 32-44 chars). Matched against UTF-8 bytes
+# so the scan uses plain ASCII tables rather than Unicode character classes.
+_SOL_ADDR_RE = re.compile(rb'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b', re.ASCII)
+
+# Recently dispatched addresses are remembered for _PROCESSED_TTL seconds so a CA
+# cross-posted to several groups is only handed to the callback once; at most
+# _PROCESSED_MAX are kept
+_PROCESSED_TTL = 60.0
+_PROCESSED_MAX = 4096
+
+# Messages of at least this many bytes are scanned on the listener's thread
+# pool instead of the event loop
+_OFFLOAD_SCAN_BYTES = 2048
+
+# For the prefilter in _may_contain_address(): maps base58 characters to b'x'
+# and every other byte to b' ', so an address becomes a run of at least 32 b'x'
+_B58_ALPHABET = b'123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+_B58_MASK = bytes(ord('x') if byte in _B58_ALPHABET else ord(' ') for byte in range(256))
+_ADDR_RUN = b'x' * 32
+
+
+def _may_contain_address(data):
+    """Cheap check that data has a run of 32 consecutive base58 characters.
+
+    One bytes.translate pass and a substring search, both in C, so messages
+    made of ordinary words are rejected without running the regex at all.
+    """
+    return _ADDR_RUN in data.translate(_B58_MASK)
+
+
+def _is_pubkey(address):
+    """Whether a regex match decodes to a 32-byte key rather than a random base58 blob."""
+    try:
+        return len(base58.b58decode(address)) == 32
+    except ValueError:
+        return False
+
+
+def _scan_addresses(data):
+    """Return the Solana addresses in a UTF-8 encoded message, in order of appearance."""
+    if not _may_contain_address(data):
+        return ()
+    first = _SOL_ADDR_RE.search(data)
+    if first is None:
+        return ()
+    return [
+        address
+        for address in (m.group().decode('ascii') for m in _SOL_ADDR_RE.finditer(data, first.start()))
+        if _is_pubkey(address)
+    ]
+
+
 class TelegramListener:
     def __init__(self, api_id, api_hash, bot_token, callback):
         """
@@ -25,11 +81,14 @@ class TelegramListener:
         self.callback = callback
         self.client = None
         self.running = False
-        self.monitored_groups = set()
-        self.processed_cas = set()  # To avoid processing duplicates
-        
-        # Regex pattern for Solana addresses (base58 encoded, 32-44 chars)
-        self.solana_address_pattern = re.compile(r'\b[1-9A-HJ-NP-Za-km-z]{32,44}\b')
+        # Group username -> its marked chat ID
+        self.monitored_groups = {}
+        # Marked chat IDs of the monitored groups, as found in event.chat_id
+        self.monitored_chat_ids = set()
+        # Scans long messages so a burst of them doesn't stall the event loop
+        self._scan_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ca-scan')
+        # Address -> monotonic time it was last dispatched, oldest first
+        self.processed_cas = OrderedDict()
 
     async def start(self, initial_groups=None):
         """Start monitoring Telegram groups."""
@@ -57,8 +116,7 @@ class TelegramListener:
         # In telegram_listener.py, modify the message_handler function:
     async def message_handler(self, event):
         # Skip messages from non-monitored groups
-        chat = await event.get_chat()
-        if chat not in self.monitored_groups:
+        if event.chat_id not in self.monitored_chat_ids:
             return
         
         # Skip edits, forwards, and replies
@@ -67,20 +125,41 @@ class TelegramListener:
             
         # Get message text
         message_text = event.message.text
+        if not message_text:
+            return
         
         # Find Solana addresses in the message
-        addresses = self.solana_address_pattern.findall(message_text)
+        data = message_text.encode('utf-8', 'ignore')
+        if len(data) >= _OFFLOAD_SCAN_BYTES:
+            loop = asyncio.get_running_loop()
+            addresses = await loop.run_in_executor(self._scan_pool, _scan_addresses, data)
+        else:
+            addresses = _scan_addresses(data)
+        if not addresses:
+            return
         
-        if addresses:
-            group_entity = await event.get_chat()
-            group_name = getattr(group_entity, 'title', str(group_entity.id))
+        group_name = None
+        now = time.monotonic()
+        for address in addresses:
+            # Skip addresses we just dispatched, e.g. cross-posted to another group
+            seen_at = self.processed_cas.get(address)
+            if seen_at is not None and now - seen_at < _PROCESSED_TTL:
+                continue
+            self.processed_cas[address] = now
+            self.processed_cas.move_to_end(address)
+            if len(self.processed_cas) > _PROCESSED_MAX:
+                self.processed_cas.popitem(last=False)
             
-            for address in addresses:
-                logger.info(f"Found new CA: {address} in {group_name}")
-                
-                # Call the callback function for each address found
-                if self.callback:
-                    await self.callback(address, group_name)
+            if group_name is None:
+                # Only resolve the chat when there is something to report
+                group_entity = await event.get_chat()
+                group_name = getattr(group_entity, 'title', str(group_entity.id))
+            
+            logger.info("Found new CA: %s in %s", address, group_name)
+            
+            # Call the callback function for each address found
+            if self.callback:
+                await self.callback(address, group_name)
 
     async def add_group(self, group_url):
         """Add a group to monitor."""
@@ -90,22 +169,21 @@ class TelegramListener:
         
         try:
             # Convert group URL to username
-            if group_url.startswith("https://t.me/"):
-                group_username = group_url.split("https://t.me/")[1]
-            else:
-                group_username = group_url
+            group_username = group_url.removeprefix(_TME)
             
             # Try to join the group
             entity = await self.client.get_entity(group_username)
             
             # Add to monitored groups
-            self.monitored_groups.add(entity)
+            chat_id = utils.get_peer_id(entity)
+            self.monitored_groups[group_username] = chat_id
+            self.monitored_chat_ids.add(chat_id)
             
-            logger.info(f"Added group {group_username} to monitoring")
+            logger.info("Added group %s to monitoring", group_username)
             return True
             
         except Exception as e:
-            logger.error(f"Error adding group {group_url}: {str(e)}")
+            logger.error("Error adding group %s: %s", group_url, e)
             return False
 
     async def remove_group(self, group_url):
@@ -116,38 +194,37 @@ class TelegramListener:
         
         try:
             # Convert group URL to username
-            if group_url.startswith("https://t.me/"):
-                group_username = group_url.split("https://t.me/")[1]
-            else:
-                group_username = group_url
+            group_username = group_url.removeprefix(_TME)
             
             # Find and remove the group
-            group_to_remove = None
-            for group in self.monitored_groups:
-                if isinstance(group, Channel):
-                    if group.username == group_username:
-                        group_to_remove = group
-                        break
-                elif str(group) == group_username:
-                    group_to_remove = group
-                    break
-
-            if group_to_remove:
-                self.monitored_groups.remove(group_to_remove)
-                logger.info(f"Removed group {group_username} from monitoring")
+            chat_id = self.monitored_groups.pop(group_username, None)
+
+            if chat_id is not None:
+                # Another link may point at the same chat
+                if chat_id not in self.monitored_groups.values():
+                    self.monitored_chat_ids.discard(chat_id)
+                logger.info("Removed group %s from monitoring", group_username)
                 return True
             else:
-                logger.warning(f"Group {group_username} not found in monitored groups")
+                logger.warning("Group %s not found in monitored groups", group_username)
                 return False
                 
         except Exception as e:
-            logger.error(f"Error removing group {group_url}: {str(e)}")
+            logger.error("Error removing group %s: %s", group_url, e)
             return False
 
+    async def run_until_disconnected(self):
+        """Wait until the client disconnects, or forever if it was never started."""
+        if self.client:
+            await self.client.run_until_disconnected()
+        else:
+            await asyncio.Event().wait()
+
     async def stop(self):
         """Stop the listener."""
         if self.client:
             await self.client.disconnect()
             self.client = None
         self.running = False
+        self._scan_pool.shutdown(wait=False)
         logger.info("Telegram listener stopped")
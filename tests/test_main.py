@@ -0,0 +1,106 @@
+import asyncio
+import sys
+
+import pytest
+
+pytest.importorskip("telegram")
+pytest.importorskip("aiofiles")
+pytest.importorskip("msgspec")
+pytest.importorskip("orjson")
+
+import main
+
+
+def test_settings_load_replaces_non_finite_values_and_keeps_unknown_keys(tmp_path):
+    path = tmp_path / 'trading_settings.json'
+    path.write_text('{"take_profit_percentage": NaN, "max_slippage": null, "note": "mine"}')
+
+    settings = main._cached_json_load(str(path), main.TradingSettings)
+
+    assert settings['take_profit_percentage'] == 30
+    assert settings['max_slippage'] == 1
+    assert settings['note'] == 'mine'
+
+
+def test_credentials_keep_quotes_inside_values(tmp_path, monkeypatch):
+    (tmp_path / 'credentials.txt').write_text(
+        'api_id = "123"\n'
+        "api_hash='a\"b'\n"
+        'bot_token=it\'s"secret\r\n'
+    )
+    monkeypatch.chdir(tmp_path)
+
+    credentials = main.TradingBot()._load_credentials()
+
+    assert credentials == {'api_id': '123', 'api_hash': 'a"b', 'bot_token': 'it\'s"secret'}
+
+
+def test_price_poll_interval_stays_at_minimum_near_take_profit():
+    # Right after entry with a 30% take profit
+    assert main._price_poll_interval(1, 1.3, 0.3) == main.MIN_PRICE_POLL_INTERVAL
+    # Backs off only past twice the take-profit distance
+    assert main._price_poll_interval(1, 2.2, 0.3) == pytest.approx(2 * main.MIN_PRICE_POLL_INTERVAL)
+    assert main._price_poll_interval(0.01, 1.3, 0.3) == main.MAX_PRICE_POLL_INTERVAL
+    assert main._price_poll_interval(0, 1.3, 0.3) == main.MIN_PRICE_POLL_INTERVAL
+
+
+def test_wallet_load_keeps_unknown_keys_and_integer_settings_stay_integers(tmp_path):
+    wallets_path = tmp_path / 'wallets.json'
+    wallets_path.write_text(
+        '{"wallets": [{"public_key": "pub", "private_key": "priv", "created": 1700000000}],'
+        ' "active_wallet_index": 0}'
+    )
+    settings_path = tmp_path / 'trading_settings.json'
+    settings_path.write_text('{"take_profit_percentage": 25}')
+
+    wallets = main._cached_json_load(str(wallets_path), main.WalletStore)
+    settings = main._cached_json_load(str(settings_path), main.TradingSettings)
+
+    assert wallets['wallets'] == [
+        {'public_key': 'pub', 'private_key': 'priv', 'created': 1700000000, 'name': 'Wallet 1'}
+    ]
+    assert settings['take_profit_percentage'] == 25
+    assert type(settings['take_profit_percentage']) is int
+
+
+def test_mistyped_setting_stops_startup_with_a_logged_error(tmp_path, monkeypatch, caplog):
+    (tmp_path / 'trading_settings.json').write_text('{"initial_investment": "0.5"}')
+    monkeypatch.chdir(tmp_path)
+
+    with pytest.raises(SystemExit):
+        main.TradingBot()._load_trading_settings()
+
+    assert 'initial_investment' in caplog.text
+
+
+def test_rejected_batch_is_resent_one_by_one_with_pacing(monkeypatch):
+    from telegram.error import BadRequest
+
+    monkeypatch.setattr(main, 'NOTIFY_MIN_INTERVAL', 0.05)
+    sent = []
+
+    class FakeBot:
+        async def send_message(self, chat_id, text, parse_mode):
+            if main.NOTIFY_SEPARATOR in text:
+                raise BadRequest("Can't parse entities")
+            sent.append(asyncio.get_running_loop().time())
+
+    bot = main.TradingBot()
+    bot.telegram_bot = type('FakeApplication', (), {'bot': FakeBot()})()
+
+    asyncio.run(bot._send_notification(1, ['a', 'b', 'c']))
+
+    assert len(sent) == 3
+    assert all(later - earlier >= 0.045 for earlier, later in zip(sent, sent[1:]))
+
+
+def test_setup_without_credentials_exits_before_importing_the_trading_stack(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delitem(sys.modules, 'solana_trader', raising=False)
+    monkeypatch.delitem(sys.modules, 'telegram_listener', raising=False)
+
+    with pytest.raises(SystemExit):
+        asyncio.run(main.TradingBot().async_setup())
+
+    assert 'solana_trader' not in sys.modules
+    assert 'telegram_listener' not in sys.modules
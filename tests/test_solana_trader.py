@@ -0,0 +1,95 @@
+import asyncio
+import base64
+
+import pytest
+
+pytest.importorskip("solana")
+pytest.importorskip("base58")
+pytest.importorskip("orjson")
+
+from solana.keypair import Keypair
+from solana.transaction import Transaction
+import orjson
+
+from solana_trader import SolanaTrader
+
+
+def test_withdraw_sends_signed_transfer():
+    trader = SolanaTrader()
+    trader.create_new_wallet()
+    destination = str(Keypair().public_key)
+    sent = []
+
+    async def fake_rpc_batch(calls):
+        if calls[0][0] == 'sendTransaction':
+            sent.append(base64.b64decode(calls[0][1][0]))
+            return ['sig']
+        # Balance, then a blockhash (any base58 encoded 32 bytes will do)
+        return [{'value': 10**9}, {'value': {'blockhash': str(Keypair().public_key)}}]
+
+    trader._rpc_batch = fake_rpc_batch
+
+    result = asyncio.run(trader.withdraw(0.5, destination))
+
+    assert result == {'success': True, 'signature': 'sig'}
+    transaction = Transaction.deserialize(sent[0])
+    assert transaction.compile_message().account_keys[0] == trader.keypair.public_key
+    assert transaction.verify_signatures()
+
+
+def test_token_price_lookups_share_one_request_and_skip_caching_failures():
+    trader = SolanaTrader()
+    calls = []
+
+    async def fake_fetch_token_price(token_address):
+        calls.append(token_address)
+        await asyncio.sleep(0)
+        if len(calls) == 1:
+            raise RuntimeError("quote failed")
+        return 0.5
+
+    trader._fetch_token_price = fake_fetch_token_price
+
+    async def lookups():
+        failed = await asyncio.gather(*(trader.get_token_price('mint') for _ in range(3)))
+        priced = await asyncio.gather(*(trader.get_token_price('mint') for _ in range(3)))
+        return failed, priced
+
+    failed, priced = asyncio.run(lookups())
+
+    assert failed == [0, 0, 0]
+    assert priced == [0.5, 0.5, 0.5]
+    assert calls == ['mint', 'mint']
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self.content = orjson.dumps(body)
+
+    def raise_for_status(self):
+        pass
+
+
+class _FakeHTTP:
+    def __init__(self, body):
+        self.body = body
+
+    async def post(self, url, content, headers):
+        return _FakeResponse(self.body)
+
+
+def _batch_error(body):
+    trader = SolanaTrader(http_client=_FakeHTTP(body))
+    with pytest.raises(RuntimeError) as excinfo:
+        asyncio.run(trader._rpc_batch([('getBalance', ['a']), ('getLatestBlockhash', [])]))
+    return str(excinfo.value)
+
+
+def test_rpc_batch_reports_whole_batch_errors():
+    body = {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32600, 'message': 'Invalid request'}}
+    assert 'Invalid request' in _batch_error(body)
+
+
+def test_rpc_batch_reports_missing_results():
+    body = [{'jsonrpc': '2.0', 'id': 0, 'result': {'value': 1}}]
+    assert 'getLatestBlockhash' in _batch_error(body)
@@ -0,0 +1,17 @@
+import pytest
+
+pytest.importorskip("telethon")
+pytest.importorskip("base58")
+
+from telegram_listener import _may_contain_address, _scan_addresses
+
+WSOL = b'So11111111111111111111111111111111111111112'
+
+
+def test_prefilter_rejects_ordinary_sentences():
+    assert not _may_contain_address(b"Has anyone checked the chart today? Looks like it is pumping hard again")
+    assert _may_contain_address(b"CA: " + WSOL + b" go")
+
+
+def test_scan_finds_addresses_in_order():
+    assert _scan_addresses(b"first " + WSOL + b" then nothing") == [WSOL.decode()]
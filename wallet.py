@@ -1,26 +1,48 @@
-import solana
+import base58
+from solana.keypair import Keypair
+from solana.publickey import PublicKey
+from solana.transaction import Transaction
+from solana.system_program import transfer, TransferParams
 
 class Wallet:
-    def __init__(self):
+    def __init__(self, client):
+        """
+        Initialize the wallet.
+
+        Args:
+            client: solana.rpc.async_api.AsyncClient to talk to the cluster with,
+                e.g. the one owned by SolanaTrader
+        """
+        self._client = client
+        self.keypair = None
         self.public_key = None
         self.private_key = None
 
     def create_wallet(self):
         # Create a new wallet
-        self.public_key, self.private_key = solana.account.create_account()
+        self.keypair = Keypair()
+        self.public_key = str(self.keypair.public_key)
+        self.private_key = base58.b58encode(self.keypair.secret_key).decode('utf-8')
         return self.public_key
 
-    def get_balance(self, address=None):
-        # Get the wallet balance
-        if address:
-            return solana.rpc.api.get_balance(address)
-        else:
-            return solana.rpc.api.get_balance(self.public_key)
+    async def get_balance(self, address=None):
+        # Get the wallet balance in lamports
+        response = await self._client.get_balance(PublicKey(address or self.public_key))
+        return response.value
 
-    def withdraw(self, amount):
-        # Withdraw funds from the wallet
-        solana.rpc.api.transfer_sol(self.public_key, amount)
+    async def withdraw(self, amount, destination):
+        # Withdraw lamports from the wallet to destination
+        transaction = Transaction().add(
+            transfer(
+                TransferParams(
+                    from_pubkey=self.keypair.public_key,
+                    to_pubkey=PublicKey(destination),
+                    lamports=amount
+                )
+            )
+        )
+        return await self._client.send_transaction(transaction, self.keypair)
 
-    def get_transaction_history(self):
+    async def get_transaction_history(self):
         # Get the transaction history
-        return solana.rpc.api.get_transaction_history(self.public_key)
\ No newline at end of file
+        return await self._client.get_signatures_for_address(PublicKey(self.public_key))